@@ -27,13 +27,14 @@ class Button:
         self.text = text
         self.color = color
         self.action = action
+        # Nhãn nút không đổi nên chỉ render chữ một lần
+        self.text_surface = font.render(self.text, True, BLACK)
+        self.text_rect = self.text_surface.get_rect(center=self.rect.center)
 
     def draw(self, screen):
         pygame.draw.rect(screen, self.color, self.rect)
         pygame.draw.rect(screen, BLACK, self.rect, 1)
-        text_surface = font.render(self.text, True, BLACK)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self.text_surface, self.text_rect)
 
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
@@ -101,6 +102,15 @@ class Shape:
         rotated_surface.blit(temp_surface, rotated_rect)
         screen.blit(rotated_surface, (self.x, self.y))
 
+    def get_draw_rect(self):
+        # Vùng màn hình bị ảnh hưởng khi vẽ hình đã xoay (hộp bao của hình xoay)
+        angle_rad = math.radians(self.rotation)
+        cos_a = abs(math.cos(angle_rad))
+        sin_a = abs(math.sin(angle_rad))
+        width = math.ceil(self.width * cos_a + self.height * sin_a)
+        height = math.ceil(self.width * sin_a + self.height * cos_a)
+        return pygame.Rect(self.x, self.y, width + 1, height + 1)
+
     def is_point_inside(self, mouse_x, mouse_y):
         local_x = mouse_x - self.x
         local_y = mouse_y - self.y
@@ -116,6 +126,11 @@ class Editor:
     def __init__(self):
         self.shapes = []
         self.current_shape_type = "square"
+        self.culled_count = 0  # Số hình bị bỏ qua ở khung hình trước (trong suốt hoặc ngoài màn hình)
+        self.dirty = True  # Chỉ vẽ lại khi có thao tác hoặc trạng thái thay đổi
+        self._toolbar_surface = None  # Thanh công cụ tĩnh, vẽ sẵn một lần
+        self._status_text = None  # Dòng trạng thái đã render lần trước
+        self._status_surface = None
         self.buttons = [
             Button(10, 10, 180, 40, "Add Square", LIGHT_GRAY, lambda: self.add_shape("square", 250, 100, 100, 100)),
             Button(10, 60, 180, 40, "Add Outline Square", LIGHT_GRAY, lambda: self.add_shape("outline_square", 250, 100, 100, 100)),
@@ -191,12 +206,18 @@ class Editor:
 
         return False, (0, 0), None
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
+            # Nhấn/thả chuột hoặc cửa sổ cần vẽ lại đều có thể làm thay đổi khung hình
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.dirty = True
+
             mouse_x, mouse_y = pygame.mouse.get_pos()
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -233,6 +254,8 @@ class Editor:
 
             if event.type == pygame.MOUSEMOTION:
                 for shape in self.shapes:
+                    if shape.dragging or shape.resizing:
+                        self.dirty = True
                     if shape.dragging:
                         shape.x = mouse_x - shape.mouse_offset[0]
                         shape.y = mouse_y - shape.mouse_offset[1]
@@ -277,13 +300,34 @@ class Editor:
                             if shape.resize_edge in ["top-left", "top-right", "top"]:
                                 shape.y = shape.original_pos[1] + shape.original_size[1] - 15
 
+    def _get_toolbar_surface(self):
+        # Thanh công cụ và các nút không đổi, nên vẽ một lần rồi dùng lại
+        if self._toolbar_surface is None:
+            toolbar = pygame.Surface((TOOLBAR_WIDTH, HEIGHT))
+            toolbar.fill(GRAY)
+            for button in self.buttons:
+                button.draw(toolbar)
+            self._toolbar_surface = toolbar
+        return self._toolbar_surface
+
+    def _get_status_surface(self, status_text):
+        # Chỉ render lại dòng trạng thái khi nội dung thay đổi
+        if status_text != self._status_text:
+            self._status_text = status_text
+            self._status_surface = font.render(status_text, True, BLACK)
+        return self._status_surface
+
     def draw(self, screen):
         screen.fill(WHITE)
-        pygame.draw.rect(screen, GRAY, (0, 0, TOOLBAR_WIDTH, HEIGHT))
-        for button in self.buttons:
-            button.draw(screen)
+        screen.blit(self._get_toolbar_surface(), (0, 0))
+        # Bỏ qua các hình trong suốt hoặc nằm ngoài màn hình trước khi vẽ
+        viewport = screen.get_rect()
+        culled = 0
         for shape in self.shapes:
-            shape.draw(screen)
+            if shape.alpha > 0 and shape.get_draw_rect().colliderect(viewport):
+                shape.draw(screen)
+            else:
+                culled += 1
             if shape.selected:
                 # Vẽ đường viền bao quanh hình khối
                 border_x = shape.x - 5
@@ -292,22 +336,26 @@ class Editor:
                 border_height = shape.height + 10
                 pygame.draw.rect(screen, BLACK, (border_x, border_y, border_width, border_height), 2)
 
+        self.culled_count = culled
+
         selected_shape = next((shape for shape in self.shapes if shape.selected), None)
         if selected_shape:
             status_text = f"Selected: {selected_shape.shape_type}, Alpha: {selected_shape.alpha}, Rotation: {selected_shape.rotation}"
         else:
             status_text = "No shape selected"
-        status_surface = font.render(status_text, True, BLACK)
-        screen.blit(status_surface, (TOOLBAR_WIDTH + 10, HEIGHT - 30))
+        screen.blit(self._get_status_surface(status_text), (TOOLBAR_WIDTH + 10, HEIGHT - 30))
 
         pygame.display.flip()
+        self.dirty = False
 
 # Khởi tạo editor và vòng lặp chính
 editor = Editor()
 clock = pygame.time.Clock()
 
 while True:
-    editor.handle_events()
-    editor.draw(screen)
-    clock.tick(60)
+    if editor.dirty:
+        clock.tick(60)  # Giới hạn tối đa 60 khung hình/giây khi đang kéo thả liên tục
+        editor.draw(screen)
+    # Chờ sự kiện tiếp theo thay vì vẽ lại liên tục khi không có thao tác
+    editor.handle_events([pygame.event.wait()] + pygame.event.get())
 
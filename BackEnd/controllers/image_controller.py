@@ -1,7 +1,9 @@
+import numpy as np
 import pygame
 from PIL import Image
 from models.image_model import ImageModel
 from tools.image_tool import ImageTool
+from utils.geometry_utils import points_inside_rects
 
 class ImageController:
     def __init__(self):
@@ -11,6 +13,14 @@ class ImageController:
         self._image_models = []  # List to store all image models
         self._active_model = None  # The currently selected active image model
         self._image_tool = None  # The image tool for editing images
+        self._rects = None  # Cached (x, y, width, height, rotation) rows for batch hit-testing
+
+        # Proxy editing: interactive actions run on a downsample of the tool's image and are replayed
+        # at full resolution on commit
+        self.proxy_size = None  # Longest side of the proxy image in pixels, or None to edit at full resolution
+        self._proxy_tool = None  # ImageTool editing the downsample, created on the first proxied action
+        self._proxy_factor = 1.0  # Proxy pixels per source pixel
+        self._pending_actions = []  # (action, args) applied to the proxy but not yet to the full-resolution tool
     
     def create_image_model(self, file_path, x=0, y=0):
         """
@@ -23,6 +33,7 @@ class ImageController:
         """
         image_model = ImageModel(file_path, x, y)
         self._image_models.append(image_model)
+        self._rects = None
         return image_model
     
     def select_image_model(self, mouse_x, mouse_y):
@@ -36,8 +47,12 @@ class ImageController:
         Returns:
             ImageModel: The selected image model, or None if no model is selected
         """
-        for model in reversed(self._image_models):
-            if model.is_point_inside(mouse_x, mouse_y):
+        if self._image_models:
+            if self._rects is None:
+                self._rects = np.array([(m.x, m.y, m.width, m.height, m.rotation) for m in self._image_models], dtype=float)
+            hits = points_inside_rects(self._rects, (mouse_x, mouse_y)).nonzero()[0]
+            if hits.size:
+                model = self._image_models[hits[-1]]  # Topmost hit
                 if self._active_model:
                     self._active_model.selected = False  # Deselect previous model
                 model.selected = True
@@ -58,6 +73,7 @@ class ImageController:
         """
         if self._active_model:
             self._active_model.move(dx, dy)
+            self._rects = None
     
     def rotate_active_model(self, angle):
         """
@@ -68,16 +84,17 @@ class ImageController:
         """
         if self._active_model:
             self._active_model.rotate(angle)
+            self._rects = None
     
     def flip_active_model_horizontal(self):
         """Flip the currently active image model horizontally."""
         if self._active_model:
-            self._active_model.image = pygame.transform.flip(self._active_model.image, True, False)
+            self._active_model.set_image(pygame.transform.flip(self._active_model.image, True, False))
     
     def flip_active_model_vertical(self):
         """Flip the currently active image model vertically."""
         if self._active_model:
-            self._active_model.image = pygame.transform.flip(self._active_model.image, False, True)
+            self._active_model.set_image(pygame.transform.flip(self._active_model.image, False, True))
     
     def add_image_tool(self, x, y, width, height):
         """
@@ -90,41 +107,131 @@ class ImageController:
             height (int): Height of the tool's area
         """
         self._image_tool = ImageTool(x, y, width, height)
-    
+        self._drop_proxy()
+
+    def set_proxy_size(self, proxy_size):
+        """
+        Turn proxy editing on or off. Pending proxy edits are committed first.
+        
+        Args:
+            proxy_size (int): Longest side of the proxy image in pixels (e.g. the canvas size),
+                or None to apply every action at full resolution
+        """
+        self.commit_image_tool()
+        self.proxy_size = proxy_size
+
     def apply_image_tool_action(self, action, *args):
         """
         Apply a specific image tool action like flipping, rotating, etc.
         
+        In proxy mode the action runs on the downsampled proxy with its pixel sizes scaled to match,
+        and is recorded so commit_image_tool() can replay it at full resolution.
+        
         Args:
             action (str): The action to perform (flip, rotate, etc.)
             *args: Additional arguments for the action (e.g., angle for rotate)
         """
         if self._image_tool:
-            if action == "flip_horizontal":
-                self._image_tool.flip_horizontal()
-            elif action == "flip_vertical":
-                self._image_tool.flip_vertical()
-            elif action == "rotate":
-                angle = args[0] if args else 0
-                self._image_tool.rotate(angle)
-            elif action == "round_corners":
-                radius = args[0] if args else 10
-                self._image_tool.round_corners(radius)
-            elif action == "add_border":
-                border_size = args[0] if args else 10
-                border_color = args[1] if len(args) > 1 else (0, 0, 0)
-                self._image_tool.add_border(border_size, border_color)
-            elif action == "adjust_transparency":
-                alpha = args[0] if args else 255
-                self._image_tool.adjust_transparency(alpha)
-            elif action == "crop":
-                box = args[0] if args else (0, 0, self._image_tool.width, self._image_tool.height)
-                self._image_tool.crop(box)
+            proxy_tool = self._get_proxy_tool()
+            if proxy_tool is not None:
+                self._pending_actions.append((action, args))
+                self._apply_action(proxy_tool, action, self._proxy_args(action, args))
+            else:
+                self._apply_action(self._image_tool, action, args)
+
+    def _apply_action(self, tool, action, args):
+        """Run one named action on an ImageTool."""
+        if action == "flip_horizontal":
+            tool.flip_horizontal()
+        elif action == "flip_vertical":
+            tool.flip_vertical()
+        elif action == "rotate":
+            angle = args[0] if args else 0
+            tool.rotate(angle)
+        elif action == "round_corners":
+            radius = args[0] if args else 10
+            tool.round_corners(radius)
+        elif action == "add_border":
+            border_size = args[0] if args else 10
+            border_color = args[1] if len(args) > 1 else (0, 0, 0)
+            tool.add_border(border_size, border_color)
+        elif action == "adjust_transparency":
+            alpha = args[0] if args else 255
+            tool.adjust_transparency(alpha)
+        elif action == "brightness":
+            tool.adjust_brightness(args[0] if args else 1.0)
+        elif action == "contrast":
+            tool.adjust_contrast(args[0] if args else 1.0)
+        elif action == "saturation":
+            tool.adjust_saturation(args[0] if args else 1.0)
+        elif action == "invert":
+            tool.invert_colors()
+        elif action == "grayscale":
+            tool.to_grayscale()
+        elif action == "crop":
+            box = args[0] if args else (0, 0, tool.width, tool.height)
+            tool.crop(box)
+
+    def _proxy_args(self, action, args):
+        """Scale an action's pixel-sized arguments (radius, border, crop box) to proxy resolution."""
+        factor = self._proxy_factor
+        if action == "round_corners":
+            return (round((args[0] if args else 10) * factor),)
+        if action == "add_border":
+            return (round((args[0] if args else 10) * factor),) + tuple(args[1:])
+        if action == "crop" and args:
+            return (tuple(round(value * factor) for value in args[0]),)
+        return args  # Angles, flips and color adjustments do not depend on resolution
+
+    def _get_proxy_tool(self):
+        """Return the proxy ImageTool, downsampling the committed image on first use; None when not needed."""
+        if self._proxy_tool is None and self.proxy_size:
+            image = self._image_tool.current_image
+            factor = self.proxy_size / max(image.size)
+            if factor >= 1:
+                return None  # Already small enough to edit directly
+            size = (max(1, round(image.width * factor)), max(1, round(image.height * factor)))
+            self._proxy_tool = ImageTool(self._image_tool.x, self._image_tool.y, *size)
+            self._proxy_tool.current_image = image.resize(size, Image.Resampling.BOX)
+            self._proxy_factor = factor
+        return self._proxy_tool
+
+    def _drop_proxy(self):
+        """Forget the proxy and the actions recorded on it."""
+        self._proxy_tool = None
+        self._proxy_factor = 1.0
+        self._pending_actions = []
+
+    def get_image_tool_image(self):
+        """
+        Get the edited image to display: the proxy while proxy edits are pending, else the full-resolution result.
+        
+        Returns:
+            PIL.Image: The edited image, or None without an image tool
+        """
+        if self._proxy_tool is not None:
+            return self._proxy_tool.current_image
+        return self._image_tool.current_image if self._image_tool else None
+
+    def commit_image_tool(self):
+        """
+        Replay the actions recorded in proxy mode on the full-resolution image (e.g. on apply or export).
+        
+        Returns:
+            PIL.Image: The full-resolution edited image, or None without an image tool
+        """
+        if not self._image_tool:
+            return None
+        for action, args in self._pending_actions:
+            self._apply_action(self._image_tool, action, args)
+        self._drop_proxy()  # The next proxied action downsamples the committed result
+        return self._image_tool.current_image
     
     def reset_image_tool(self):
         """Reset the image tool to its original state."""
         if self._image_tool:
             self._image_tool.reset_to_original()
+            self._drop_proxy()
 
     def get_all_image_models(self):
         """Get all image models managed by the controller."""
@@ -143,5 +250,6 @@ class ImageController:
         """
         if image_model in self._image_models:
             self._image_models.remove(image_model)
+            self._rects = None
             if self._active_model == image_model:
                 self._active_model = None
@@ -1,10 +1,12 @@
 # controllers/interaction_controller.py
 import pygame
 import math
-from utils.geometry_utils import is_near_border
+from utils.geometry_utils import apply_transform
+from utils.handle_utils import ResizeHandles, resize_from_handle
+from tools.snap_tool import SnapEngine
 
 class InteractionController:
-    def __init__(self, layer_controller):
+    def __init__(self, layer_controller, canvas_size=None, grid_size=None, coalesce_motion=True):
         """Initialize with a LayerController instead of a list of objects."""
         self.layer_controller = layer_controller  # Reference to LayerController
         self.selected_layer = None  # Currently selected layer
@@ -14,16 +16,38 @@ class InteractionController:
         self.resize_edge = None  # Edge or corner being resized
         self.original_pos = (0, 0)  # Original position before resizing
         self.original_size = (0, 0)  # Original size before resizing
+        self.original_transform = None  # Layer transform when resizing started
+        self.original_inverse = None  # Inverse of original_transform
+        self.handles = ResizeHandles()  # Resize handles of the selected layer
+        self.snapping = True  # Snap drags to other layers, the canvas center and the grid
+        self.snap_engine = SnapEngine(grid_size=grid_size, canvas_size=canvas_size)
+        self.guides = []  # Smart-guide lines of the last snapped drag step, for the UI to draw
+        self.coalesce_motion = coalesce_motion  # Collapse each burst of MOUSEMOTION events into the latest one
+        self.merged_motion_events = 0  # Total motion events dropped by coalescing
 
     def is_near_border(self, mouse_x, mouse_y, layer):
         """Check if mouse is near a border or corner of a layer for resizing."""
         if not layer.selected:
             return False, None
-        return is_near_border(layer.x, layer.y, layer.width, layer.height, mouse_x, mouse_y)
+        if self.handles.layer is not layer:
+            self.handles.attach(layer)
+        edge = self.handles.hit_test(mouse_x, mouse_y)
+        return edge is not None, edge
 
     def handle_events(self):
-        """Handle mouse events for interaction."""
+        """Handle mouse events for interaction; returns how many motion events were merged this frame."""
+        pending_motion = None  # Latest motion event not processed yet
+        merged = 0
         for event in pygame.event.get():
+            if event.type == pygame.MOUSEMOTION and self.coalesce_motion:
+                if pending_motion is not None:
+                    merged += 1
+                pending_motion = event
+                continue
+            if pending_motion is not None:
+                # Flush before anything else so button transitions happen at the right position
+                self._handle_mouse_motion(pending_motion)
+                pending_motion = None
             if event.type == pygame.QUIT:  # Close the application
                 pygame.quit()
                 exit()
@@ -33,9 +57,13 @@ class InteractionController:
                 self._handle_mouse_button_up(event)
             elif event.type == pygame.MOUSEMOTION:
                 self._handle_mouse_motion(event)
+        if pending_motion is not None:
+            self._handle_mouse_motion(pending_motion)
+        self.merged_motion_events += merged
+        return merged
 
     def _handle_mouse_button_down(self, event):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = event.pos
         if event.button == 1:  # Left click: Trigger drag or resize
             self._process_left_click(mouse_x, mouse_y)
         elif event.button == 3 and self.selected_layer:  # Right click: Start rotation
@@ -45,11 +73,13 @@ class InteractionController:
         if event.button == 1 and self.selected_layer:  # Left release: Stop drag or resize
             self.selected_layer.dragging = False
             self.resizing = False
+            self.snap_engine.clear()
+            self.guides = []
         elif event.button == 3:  # Right release: Stop rotation
             self.rotating = False
 
     def _handle_mouse_motion(self, event):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = event.pos
         if not self.selected_layer:  # Exit if no layer selected
             return
         if self.resizing:  # Process resizing if active
@@ -61,94 +91,33 @@ class InteractionController:
 
     def _process_left_click(self, mouse_x, mouse_y):
         """Process left-click to start dragging or resizing."""
-        # Use LayerController to select a layer
-        self.selected_layer = self.layer_controller.select_layer_at_point(mouse_x, mouse_y)
-        if self.selected_layer:
+        is_near, edge = False, None
+        if self.selected_layer:  # Handles reach outside the layer, so test the current selection first
             is_near, edge = self.is_near_border(mouse_x, mouse_y, self.selected_layer)
+        if not is_near:
+            # Use LayerController to select a layer
+            self.selected_layer = self.layer_controller.select_layer_at_point(mouse_x, mouse_y)
+            if self.selected_layer:
+                is_near, edge = self.is_near_border(mouse_x, mouse_y, self.selected_layer)
+        if self.selected_layer:
             if is_near:  # Start resizing if near border
                 self.resizing = True
                 self.resize_edge = edge
                 self.original_pos = (self.selected_layer.x, self.selected_layer.y)
                 self.original_size = (self.selected_layer.width, self.selected_layer.height)
+                self.original_transform = self.selected_layer.get_transform()
+                self.original_inverse = self.selected_layer.get_inverse_transform()
             else:  # Start dragging if inside layer
                 self.drag_offset = (mouse_x - self.selected_layer.x, mouse_y - self.selected_layer.y)
+                if self.snapping:
+                    self.snap_engine.build(self.layer_controller.get_visible_layers(), exclude=[self.selected_layer])
 
     def _process_resize(self, mouse_x, mouse_y):
-        """Process resizing based on mouse position."""
-        border_x, border_y = self.selected_layer.x - 5, self.selected_layer.y - 5
-        resize_handlers = {
-            "top-left": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    self.original_size[0] + (self.original_pos[0] - mouse_x + 5),
-                    self.original_size[1] + (self.original_pos[1] - mouse_y + 5),
-                    mouse_x - 5,
-                    mouse_y - 5
-                )
-            ),
-            "top-right": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    mouse_x - border_x - 5,
-                    self.original_size[1] + (self.original_pos[1] - mouse_y + 5),
-                    None,
-                    mouse_y - 5
-                )
-            ),
-            "bottom-left": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    self.original_size[0] + (self.original_pos[0] - mouse_x + 5),
-                    mouse_y - border_y - 5,
-                    mouse_x - 5,
-                    None
-                )
-            ),
-            "bottom-right": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    mouse_x - border_x - 5,
-                    mouse_y - border_y - 5
-                )
-            ),
-            "top": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    self.selected_layer.width,
-                    self.original_size[1] + (self.original_pos[1] - mouse_y + 5),
-                    None,
-                    mouse_y - 5
-                )
-            ),
-            "bottom": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    self.selected_layer.width,
-                    mouse_y - border_y - 5
-                )
-            ),
-            "left": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    self.original_size[0] + (self.original_pos[0] - mouse_x + 5),
-                    self.selected_layer.height,
-                    mouse_x - 5,
-                    None
-                )
-            ),
-            "right": lambda: (
-                self.layer_controller.resize_layer(
-                    self.selected_layer,
-                    mouse_x - border_x - 5,
-                    self.selected_layer.height
-                )
-            )
-        }
-
-        # Execute resizing handler based on edge
-        handler = resize_handlers.get(self.resize_edge)
-        if handler:
-            handler()
+        """Process resizing based on mouse position, in the layer's rotated frame."""
+        local_x, local_y = apply_transform(self.original_inverse, mouse_x, mouse_y)
+        width, height, left, top = resize_from_handle(self.resize_edge, self.original_size, local_x, local_y)
+        new_x, new_y = apply_transform(self.original_transform, left, top)
+        self.layer_controller.resize_layer(self.selected_layer, width, height, new_x, new_y)
 
     def _process_drag(self, mouse_x, mouse_y):
         """Process dragging based on mouse position."""
@@ -157,10 +126,16 @@ class InteractionController:
         new_y = mouse_y - self.drag_offset[1]
         dx = new_x - self.selected_layer.x
         dy = new_y - self.selected_layer.y
+        if self.snapping:
+            min_x, min_y, max_x, max_y = self.selected_layer.get_bounds()
+            snap_dx, snap_dy, self.guides = self.snap_engine.snap((min_x + dx, min_y + dy, max_x + dx, max_y + dy))
+            dx += snap_dx
+            dy += snap_dy
         self.layer_controller.move_layer(self.selected_layer, dx, dy)
 
     def _process_rotation(self, mouse_x, mouse_y):
         """Process rotation based on mouse position."""
+        # The unrotated center: layers pivot about (x, y), so get_center() moves as the rotation changes
         center_x = self.selected_layer.x + self.selected_layer.width // 2
         center_y = self.selected_layer.y + self.selected_layer.height // 2
         dx = mouse_x - center_x
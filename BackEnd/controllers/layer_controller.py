@@ -1,105 +1,151 @@
 # controllers/layer_controller.py
 import copy
+import math
+
+import numpy as np
 
 from BackEnd.models.layer_model import LayerModel
+from BackEnd.models.layerList_model import LayerList
+from BackEnd.utils.spatial_index import SpatialGrid
+from BackEnd.tools.selection_tool import SelectionSet
 
 class LayerController:
     def __init__(self, layerList_model):
         """Initialize the layer controller with a layer list model."""
         self.layerList_model = layerList_model  # LayerList to store layers
-        self.layers = layerList_model.layers if hasattr(layerList_model, 'layers') else []  # List of LayerModel instances
-        self.selected_layer = None  # Currently selected layer
+        # Id-keyed store of LayerModel instances, kept in z-order
+        self.layers = layerList_model if isinstance(layerList_model, LayerList) else LayerList()
+        self.selected_layer = None  # Currently selected layer (primary layer of the selection)
+        self.selection = SelectionSet()  # All selected layers
+        self.spatial_index = SpatialGrid()  # Grid over rotated layer bounds for picking
+        self._change_listeners = []  # Callbacks receiving the list of layers touched by each change
+        for layer in self.layers:
+            self._index_layer(layer)
+
+    def _index_layer(self, layer):
+        """Insert or refresh a layer's rotated bounds in the spatial index."""
+        self.spatial_index.insert(layer.id, layer, layer.get_bounds())
+
+    def add_change_listener(self, callback):
+        """Register a callback called with the list of affected layers after every change."""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        """Unregister a change callback."""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _notify_changed(self, layers):
+        """Tell every listener which layers changed."""
+        for callback in list(self._change_listeners):
+            callback(layers)
+
+    def notify_layers_changed(self, layers):
+        """Report edits made outside the controller (e.g. shape styling) to the change listeners."""
+        self.layers.touch()
+        self._notify_changed(list(layers))
+
+    def _geometry_changed(self, layers):
+        """Re-index moved, rotated or resized layers and emit a single change notification."""
+        for layer in layers:
+            self._index_layer(layer)
+        self.layers.touch()
+        self._notify_changed(layers)
+
+    def _editable_layers(self, layers):
+        """Return the given layers that belong to this controller and are not locked."""
+        return [layer for layer in layers if layer in self.layers and not layer.locked]
 
     def add_layer(self, obj, name=None):
         """Add a new layer with the given object."""
         layer = LayerModel(obj, name)
-        layer.order = len(self.layers)  # Set order to the topmost
-        self.layers.append(layer)
+        self.layers.append(layer)  # Assigns the topmost order
+        self._index_layer(layer)
+        self._notify_changed([layer])
         return layer
 
     def delete_layer(self, layer):
         """Remove a layer from the list."""
         if layer in self.layers:
             self.layers.remove(layer)
+            self.spatial_index.remove(layer.id)
+            self.selection.remove(layer)
             if self.selected_layer == layer:
-                self.selected_layer = None
-            # Update orders of remaining layers
-            for i, l in enumerate(self.layers):
-                l.order = i
+                self.selected_layer = self.selection.primary
+            self._notify_changed([layer])
 
     def duplicate_layer(self, layer):
         """Create a duplicate of the given layer."""
         if layer in self.layers:
-            new_obj = copy.deepcopy(layer.object)
+            # Objects holding pixels share them copy-on-write instead of copying them up front
+            duplicate = getattr(layer.object, "duplicate", None)
+            new_obj = duplicate() if duplicate is not None else copy.deepcopy(layer.object)
             new_layer = LayerModel(new_obj, f"{layer.name} (Copy)")
             new_layer.x = layer.x + 20  # Offset position
             new_layer.y = layer.y + 20
             new_layer.width = layer.width
             new_layer.height = layer.height
             new_layer.rotation = layer.rotation
-            new_layer.order = len(self.layers)  # Add to top
-            self.layers.append(new_layer)
+            self.layers.append(new_layer)  # Add to top
+            self._index_layer(new_layer)
+            self._notify_changed([new_layer])
             return new_layer
         return None
 
     def move_layer_up(self, layer):
         """Move the layer up one position in the order."""
-        if layer in self.layers:
-            idx = self.layers.index(layer)
-            if idx < len(self.layers) - 1:
-                self.layers[idx], self.layers[idx + 1] = self.layers[idx + 1], self.layers[idx]
-                self.layers[idx].order = idx
-                self.layers[idx + 1].order = idx + 1
+        if layer in self.layers and self.layers.swap_with_neighbour(layer, 1):
+            self._notify_changed([layer])
 
     def move_layer_down(self, layer):
         """Move the layer down one position in the order."""
-        if layer in self.layers:
-            idx = self.layers.index(layer)
-            if idx > 0:
-                self.layers[idx], self.layers[idx - 1] = self.layers[idx - 1], self.layers[idx]
-                self.layers[idx].order = idx
-                self.layers[idx - 1].order = idx - 1
+        if layer in self.layers and self.layers.swap_with_neighbour(layer, -1):
+            self._notify_changed([layer])
 
     def move_layer_to_top(self, layer):
         """Move the layer to the top of the order."""
         if layer in self.layers:
-            self.layers.remove(layer)
-            self.layers.append(layer)
-            for i, l in enumerate(self.layers):
-                l.order = i
+            self.layers.move_to_top(layer)
+            self._notify_changed([layer])
 
     def move_layer_to_bottom(self, layer):
         """Move the layer to the bottom of the order."""
         if layer in self.layers:
-            self.layers.remove(layer)
-            self.layers.insert(0, layer)
-            for i, l in enumerate(self.layers):
-                l.order = i
+            self.layers.move_to_bottom(layer)
+            self._notify_changed([layer])
 
     def select_layer(self, layer):
         """Select a specific layer."""
         if layer in self.layers:
-            if self.selected_layer:
-                self.selected_layer.selected = False
+            self.selection.replace([layer])
             self.selected_layer = layer
-            layer.selected = True
 
-    def select_layer_at_point(self, mouse_x, mouse_y):
-        """Select a layer at the given mouse coordinates."""
-        for layer in reversed(self.layers):  # Check from topmost layer
+    def get_layer_at_point(self, mouse_x, mouse_y):
+        """Return the topmost visible, unlocked layer at the given coordinates without selecting it."""
+        candidates = self.spatial_index.query_point(mouse_x, mouse_y)
+        candidates.sort(key=lambda l: l.order, reverse=True)  # Check from topmost layer
+        for layer in candidates:
             if layer.visible and not layer.locked and layer.is_point_inside(mouse_x, mouse_y):
-                self.select_layer(layer)
                 return layer
+        return None
+
+    def select_layer_at_point(self, mouse_x, mouse_y):
+        """Select a layer at the given mouse coordinates."""
+        layer = self.get_layer_at_point(mouse_x, mouse_y)
+        if layer:
+            self.select_layer(layer)
+            return layer
         # Deselect if no layer is found
-        if self.selected_layer:
-            self.selected_layer.selected = False
-            self.selected_layer = None
+        self.selection.clear()
+        self.selected_layer = None
         return None
 
     def toggle_layer_visibility(self, layer):
         """Toggle the visibility of a layer."""
         if layer in self.layers:
-            layer.visible = not layer.visible
+            self.layers.set_visible(layer, not layer.visible)
+            self._notify_changed([layer])
 
     def toggle_layer_lock(self, layer):
         """Toggle the lock state of a layer."""
@@ -115,21 +161,100 @@ class LayerController:
         """Move the layer by a specified offset."""
         if layer in self.layers and not layer.locked:
             layer.move(dx, dy)
+            self._geometry_changed([layer])
 
     def rotate_layer(self, layer, angle):
         """Rotate the layer by a specified angle."""
         if layer in self.layers and not layer.locked:
             layer.rotate(angle)
+            self._geometry_changed([layer])
 
     def resize_layer(self, layer, width, height, x=None, y=None):
         """Resize the layer to new dimensions, optionally updating position."""
         if layer in self.layers and not layer.locked:
             layer.resize(width, height, x, y)
+            self._geometry_changed([layer])
+
+    def move_layers(self, layers, dx, dy):
+        """Move several layers by the same offset, skipping locked ones; returns the moved layers."""
+        layers = self._editable_layers(layers)
+        if layers:
+            for layer in layers:
+                layer.move(dx, dy)
+            self._geometry_changed(layers)
+        return layers
+
+    def rotate_layers(self, layers, angle, pivot=None):
+        """Rotate several layers by angle around a shared pivot (default: the center of their combined bounds)."""
+        layers = self._editable_layers(layers)
+        if not layers:
+            return layers
+        origins = np.array([(layer.x, layer.y) for layer in layers], dtype=float)
+        if pivot is None:
+            pivot = self._combined_center(layers)
+        angle_rad = math.radians(angle)
+        cos_a = math.cos(angle_rad)
+        sin_a = math.sin(angle_rad)
+        # Same rotation direction as LayerModel.get_transform, so every layer turns rigidly about the pivot
+        offsets = origins - pivot
+        new_origins = np.empty_like(origins)
+        new_origins[:, 0] = pivot[0] + offsets[:, 0] * cos_a + offsets[:, 1] * sin_a
+        new_origins[:, 1] = pivot[1] - offsets[:, 0] * sin_a + offsets[:, 1] * cos_a
+        for layer, (new_x, new_y) in zip(layers, new_origins.tolist()):
+            layer.rotate(angle)
+            layer.x, layer.y = new_x, new_y
+            layer.invalidate_transform()
+        self._geometry_changed(layers)
+        return layers
+
+    def scale_layers(self, layers, scale_x, scale_y, pivot=None):
+        """Scale the positions and sizes of several layers about a shared pivot (default: their combined center).
+
+        Negative factors mirror the group about the pivot. Rotated layers are resized along their own axes by
+        the factors projected into their frame, and keep their centers where the canvas scale puts them.
+        """
+        layers = self._editable_layers(layers)
+        if not layers:
+            return layers
+        geometry = np.array([(layer.x, layer.y, layer.width, layer.height, layer.rotation) for layer in layers], dtype=float)
+        if pivot is None:
+            pivot = self._combined_center(layers)
+        x, y, width, height, rotation = geometry.T
+        angle_rad = np.radians(rotation)
+        cos_a, sin_a = np.cos(angle_rad), np.sin(angle_rad)
+        # Centers on the canvas (same local-to-canvas mapping as LayerModel.get_transform), scaled about the pivot
+        center_x = pivot[0] + (x + cos_a * width / 2 + sin_a * height / 2 - pivot[0]) * scale_x
+        center_y = pivot[1] + (y - sin_a * width / 2 + cos_a * height / 2 - pivot[1]) * scale_y
+        # Stretch of each layer's local x and y axes under the canvas scale; clamped like LayerModel.resize
+        # before the origins are derived, so sizes and positions stay consistent
+        width = np.maximum(20, width * np.hypot(scale_x * cos_a, scale_y * sin_a))
+        height = np.maximum(20, height * np.hypot(scale_x * sin_a, scale_y * cos_a))
+        if scale_x * scale_y < 0:
+            # Mirroring one axis reverses the turning direction
+            rotation = (-rotation) % 360
+            angle_rad = np.radians(rotation)
+            cos_a, sin_a = np.cos(angle_rad), np.sin(angle_rad)
+        new_x = center_x - (cos_a * width / 2 + sin_a * height / 2)
+        new_y = center_y - (-sin_a * width / 2 + cos_a * height / 2)
+        for layer, values in zip(layers, np.column_stack((new_x, new_y, width, height, rotation)).tolist()):
+            layer.rotation = values[4]
+            layer.resize(values[2], values[3], values[0], values[1])
+        self._geometry_changed(layers)
+        return layers
+
+    def _combined_center(self, layers):
+        """Return the center of the layers' combined rotated bounds."""
+        bounds = np.array([layer.get_bounds() for layer in layers], dtype=float)
+        return ((bounds[:, 0].min() + bounds[:, 2].max()) / 2, (bounds[:, 1].min() + bounds[:, 3].max()) / 2)
 
     def get_layers(self):
-        """Return the list of all layers, sorted by order."""
-        return sorted(self.layers, key=lambda l: l.order)
+        """Return all layers sorted by order, as a cached read-only tuple."""
+        return self.layers.ordered()
 
     def get_visible_layers(self):
-        """Return the list of visible layers, sorted by order."""
-        return [layer for layer in self.get_layers() if layer.visible]
\ No newline at end of file
+        """Return the visible layers sorted by order, as a cached read-only tuple."""
+        return self.layers.visible()
+
+    def get_generation(self):
+        """Return a counter that changes whenever any layer is added, removed, reordered, shown, hidden or edited."""
+        return self.layers.generation
\ No newline at end of file
@@ -13,15 +13,19 @@ class ShapeController:
     def set_line_color(self, layer, color):
         if self._validate_layer(layer):
             layer.object.set_line_color(color)
+            self.layer_controller.notify_layers_changed([layer])
 
     def set_fill_color(self, layer, color):
         if self._validate_layer(layer):
             layer.object.set_fill_color(color)
+            self.layer_controller.notify_layers_changed([layer])
 
     def set_border_radius(self, layer, radius):
         if self._validate_layer(layer):
             layer.object.set_border_radius(radius)
+            self.layer_controller.notify_layers_changed([layer])
 
     def set_alpha(self, layer, alpha):
         if self._validate_layer(layer):
             layer.object.set_alpha(alpha)
+            self.layer_controller.notify_layers_changed([layer])
@@ -0,0 +1,69 @@
+# filters/basic_fillters.py
+import numpy as np
+from PIL import Image
+
+# ITU-R 601-2 luma weights, the same ones PIL uses for convert("L")
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+def _split(image):
+    """Return the image's RGB channels as a float32 array and its alpha channel (or None)."""
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    pixels = np.asarray(image)
+    alpha = pixels[..., 3] if image.mode == "RGBA" else None
+    return pixels[..., :3].astype(np.float32), alpha
+
+def _merge(rgb, alpha):
+    """Round and clip RGB values back to 8 bits and rebuild an RGB or RGBA image."""
+    rgb = np.clip(rgb + 0.5, 0, 255).astype(np.uint8)
+    if alpha is None:
+        return Image.fromarray(rgb, "RGB")
+    return Image.fromarray(np.dstack((rgb, alpha)), "RGBA")
+
+def _luma(rgb):
+    """Return the grayscale value of every pixel of an (h, w, 3) float array."""
+    # Element-wise rather than a matmul, whose BLAS rounding depends on the array shape:
+    # a pixel gets the same value whether it is filtered alone, in a tile or in the whole image
+    red, green, blue = LUMA_WEIGHTS
+    return rgb[..., 0] * red + rgb[..., 1] * green + rgb[..., 2] * blue
+
+def set_alpha(image, alpha):
+    """Return an RGBA copy of the image with every pixel's alpha set to the given value (0-255)."""
+    result = image.convert("RGBA")
+    if result is image:
+        result = image.copy()
+    result.putalpha(int(alpha))
+    return result
+
+def scale_alpha(image, factor):
+    """Return an RGBA copy of the image with its alpha channel multiplied by factor."""
+    pixels = np.array(image.convert("RGBA"))
+    pixels[..., 3] = np.clip(pixels[..., 3] * np.float32(factor) + 0.5, 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels, "RGBA")
+
+def adjust_brightness(image, factor):
+    """Scale the RGB channels by factor (0 is black, 1 is unchanged), keeping alpha."""
+    rgb, alpha = _split(image)
+    return _merge(rgb * np.float32(factor), alpha)
+
+def adjust_contrast(image, factor):
+    """Stretch the RGB channels away from the mean gray level by factor (0 is flat gray, 1 is unchanged)."""
+    rgb, alpha = _split(image)
+    mean = np.float32(_luma(rgb).mean()) if rgb.size else np.float32(0)
+    return _merge((rgb - mean) * np.float32(factor) + mean, alpha)
+
+def adjust_saturation(image, factor):
+    """Blend each pixel with its gray value (0 is grayscale, 1 is unchanged, above 1 is more colorful)."""
+    rgb, alpha = _split(image)
+    gray = _luma(rgb)[..., None]
+    return _merge(gray + (rgb - gray) * np.float32(factor), alpha)
+
+def invert(image):
+    """Invert the RGB channels, keeping alpha."""
+    rgb, alpha = _split(image)
+    return _merge(255 - rgb, alpha)
+
+def grayscale(image):
+    """Replace the RGB channels with their gray value, keeping the mode and alpha."""
+    rgb, alpha = _split(image)
+    return _merge(np.repeat(_luma(rgb)[..., None], 3, axis=2), alpha)
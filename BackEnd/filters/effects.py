@@ -0,0 +1,322 @@
+# filters/effects.py
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from filters import basic_fillters
+
+_VALUES = np.arange(256, dtype=np.float32)  # Every 8-bit input value, for building lookup tables
+
+
+def _to_uint8(values):
+    """Round and clip float pixel values back to 8 bits, the same way basic_fillters does."""
+    return np.clip(values + 0.5, 0, 255).astype(np.uint8)
+
+
+class LutEffect:
+    """Point-wise effect given as a 256-entry lookup table per RGBA channel."""
+    radius = 0
+
+    def __init__(self, lut):
+        self.lut = np.asarray(lut, dtype=np.uint8)  # (4, 256) table: lut[channel][value]
+
+    def then(self, other):
+        """Return a single table that applies this effect and then another one."""
+        return LutEffect([other.lut[channel][self.lut[channel]] for channel in range(4)])
+
+    def __call__(self, pixels):
+        result = np.empty_like(pixels)
+        for channel in range(4):
+            np.take(self.lut[channel], pixels[..., channel], out=result[..., channel])
+        return result
+
+
+class PixelEffect:
+    """Point-wise effect computed by a function of an (h, w, 4) uint8 array, e.g. one that mixes channels."""
+    radius = 0
+
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self, pixels):
+        return self.function(pixels)
+
+
+class KernelEffect:
+    """Neighbourhood effect: each output pixel depends on the input pixels within radius of it."""
+
+    def __init__(self, function, radius, padding="edge"):
+        """
+        Args:
+            function: Callback taking an (h + 2 * radius, w + 2 * radius, 4) uint8 array and returning the (h, w, 4) result
+            radius (int): Halo in pixels the function needs around its output
+            padding (str): np.pad mode used for pixels beyond the image edges ("edge" or "constant" for transparent)
+        """
+        self.function = function
+        self.radius = radius
+        self.padding = padding
+
+    def __call__(self, padded):
+        return self.function(padded)
+
+
+def _lut(rgb=None, alpha=None):
+    """Build a LutEffect from float curves over 0-255 for the color channels and/or alpha."""
+    identity = np.arange(256, dtype=np.uint8)
+    rgb = identity if rgb is None else _to_uint8(rgb)
+    alpha = identity if alpha is None else _to_uint8(alpha)
+    return LutEffect([rgb, rgb, rgb, alpha])
+
+
+def brightness(factor):
+    """Scale the RGB channels by factor (matches basic_fillters.adjust_brightness)."""
+    return _lut(rgb=_VALUES * np.float32(factor))
+
+
+def invert():
+    """Invert the RGB channels, keeping alpha."""
+    return _lut(rgb=255 - _VALUES)
+
+
+def gamma(value):
+    """Apply a gamma curve to the RGB channels (above 1 brightens the midtones)."""
+    return _lut(rgb=255 * (_VALUES / 255) ** np.float32(1 / value))
+
+
+def opacity(factor):
+    """Multiply the alpha channel by factor (matches basic_fillters.scale_alpha)."""
+    return _lut(alpha=_VALUES * np.float32(factor))
+
+
+def _per_pixel(function, *args):
+    """Wrap a basic_fillters image function as a PixelEffect."""
+    def apply(pixels):
+        image = Image.fromarray(np.ascontiguousarray(pixels), "RGBA")
+        return np.asarray(function(image, *args))
+    return PixelEffect(apply)
+
+
+def saturation(factor):
+    """Blend each pixel with its gray value (matches basic_fillters.adjust_saturation)."""
+    return _per_pixel(basic_fillters.adjust_saturation, factor)
+
+
+def grayscale():
+    """Replace the RGB channels with their gray value, keeping alpha."""
+    return _per_pixel(basic_fillters.grayscale)
+
+
+def _gaussian_kernel(radius):
+    """Normalized 1-D Gaussian weights with sigma = radius, truncated at three sigma; a single tap for radius <= 0."""
+    if radius <= 0:
+        return np.ones(1, dtype=np.float32)
+    half = max(1, math.ceil(radius * 3))
+    offsets = np.arange(-half, half + 1, dtype=np.float32)
+    weights = np.exp(-offsets * offsets / np.float32(2 * radius * radius))
+    return (weights / weights.sum()).astype(np.float32)
+
+
+def _convolve(values, kernel):
+    """
+    Convolve a padded (h + 2k, w + 2k, c) float32 array with a separable kernel of 2k + 1 taps.
+    Every output value is summed over its own neighbours in a fixed order, so a tile of the image
+    gives exactly the values a whole-image pass would.
+    """
+    half = len(kernel) // 2
+    height = values.shape[0] - 2 * half
+    width = values.shape[1] - 2 * half
+    rows = kernel[0] * values[:height]
+    for tap in range(1, len(kernel)):
+        rows += kernel[tap] * values[tap:tap + height]
+    result = kernel[0] * rows[:, :width]
+    for tap in range(1, len(kernel)):
+        result += kernel[tap] * rows[:, tap:tap + width]
+    return result
+
+
+def _unpremultiply(premultiplied, alpha):
+    """Divide premultiplied colors by alpha (0-255), leaving fully transparent pixels black."""
+    return np.where(alpha > 0, premultiplied * (255 / np.maximum(alpha, np.float32(1e-6))), 0)
+
+
+def blur(radius):
+    """Gaussian blur with sigma = radius, on premultiplied colors so transparent pixels do not bleed in."""
+    if radius <= 0:
+        return _lut()  # Nothing to blur
+    kernel = _gaussian_kernel(radius)
+
+    def apply(padded):
+        values = padded.astype(np.float32)
+        values[..., :3] *= values[..., 3:] / 255
+        blurred = _convolve(values, kernel)
+        alpha = blurred[..., 3:]
+        return _to_uint8(np.concatenate((_unpremultiply(blurred[..., :3], alpha), alpha), axis=2))
+    return KernelEffect(apply, len(kernel) // 2)
+
+
+def sharpen(radius=1, amount=1.0):
+    """Unsharp mask: push the RGB channels away from their Gaussian blur by amount, keeping alpha."""
+    if radius <= 0:
+        return _lut()  # A pixel's zero-radius blur is itself, so there is nothing to sharpen
+    kernel = _gaussian_kernel(radius)
+    half = len(kernel) // 2
+
+    def apply(padded):
+        values = padded.astype(np.float32)
+        center = values[half:-half, half:-half]
+        blurred = _convolve(values[..., :3], kernel)
+        rgb = center[..., :3] + np.float32(amount) * (center[..., :3] - blurred)
+        return _to_uint8(np.concatenate((rgb, center[..., 3:]), axis=2))
+    return KernelEffect(apply, half)
+
+
+def shadow(offset=(8, 8), radius=4, color=(0, 0, 0), opacity=0.5):
+    """Drop shadow: the image's alpha, offset by (dx, dy) pixels and blurred, composited underneath it (hard for radius <= 0)."""
+    kernel = _gaussian_kernel(radius)
+    half = len(kernel) // 2
+    dx, dy = (int(value) for value in offset)
+    halo = half + max(abs(dx), abs(dy))
+    shade_color = np.asarray(color[:3], dtype=np.float32)
+
+    def apply(padded):
+        height = padded.shape[0] - 2 * halo
+        width = padded.shape[1] - 2 * halo
+        top = halo - dy - half  # Where the alpha casting onto the first output row starts, blur halo included
+        left = halo - dx - half
+        alpha = padded[top:top + height + 2 * half, left:left + width + 2 * half, 3:].astype(np.float32) / 255
+        shade = _convolve(alpha, kernel) * np.float32(opacity)
+        center = padded[halo:halo + height, halo:halo + width].astype(np.float32)
+        front = center[..., 3:] / 255
+        behind = shade * (1 - front)
+        out_alpha = front + behind
+        rgb = np.where(out_alpha > 0,
+                       (center[..., :3] * front + shade_color * behind) / np.maximum(out_alpha, np.float32(1e-6)), 0)
+        return _to_uint8(np.concatenate((rgb, out_alpha * 255), axis=2))
+    return KernelEffect(apply, halo, padding="constant")
+
+
+class EffectsPipeline:
+    """
+    Chain of image effects run as a few passes over tiles of the image on a thread pool.
+
+    Adjacent point-wise effects are fused into one pass (lookup tables into a single table), and each
+    neighbourhood effect is one pass whose tiles read a halo of their kernel radius around them. Every
+    output pixel only depends on its own neighbourhood, so the tiled result is bit-identical to the
+    serial one.
+    """
+
+    def __init__(self, effects=None, tile_size=256, max_workers=None):
+        """
+        Initialize the pipeline; worker threads start on first use.
+
+        Args:
+            effects (list): Effects to run in order (LutEffect, PixelEffect or KernelEffect)
+            tile_size (int): Edge length of a square tile in pixels
+            max_workers (int): Number of worker threads (default: one per CPU core)
+        """
+        self.effects = list(effects or [])
+        self.tile_size = tile_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+
+    def add(self, effect):
+        """Append an effect; returns the pipeline so calls can be chained."""
+        self.effects.append(effect)
+        return self
+
+    def _get_executor(self):
+        """Create the worker threads on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _stages(self):
+        """Group the effects into passes: runs of point-wise effects fused together, and one pass per kernel effect."""
+        stages = []
+        points = []  # Point-wise effects of the current run, adjacent lookup tables already merged
+
+        def end_run():
+            if points:
+                run = list(points)
+                stages.append((lambda pixels: _run_points(run, pixels), 0, "edge"))
+                points.clear()
+
+        for effect in self.effects:
+            if isinstance(effect, KernelEffect):
+                end_run()
+                stages.append((effect, effect.radius, effect.padding))
+            elif isinstance(effect, LutEffect) and points and isinstance(points[-1], LutEffect):
+                points[-1] = points[-1].then(effect)
+            else:
+                points.append(effect)
+        end_run()
+        return stages
+
+    @staticmethod
+    def _padded(pixels, top, bottom, left, right, radius, padding):
+        """Return the pixels of a tile plus a halo of radius, padded as the whole image would be at its edges."""
+        height, width = pixels.shape[:2]
+        region = pixels[max(0, top - radius):min(height, bottom + radius),
+                        max(0, left - radius):min(width, right + radius)]
+        pad = ((max(0, radius - top), max(0, bottom + radius - height)),
+               (max(0, radius - left), max(0, right + radius - width)),
+               (0, 0))
+        if any(before or after for before, after in pad[:2]):
+            region = np.pad(region, pad, mode=padding)
+        return region
+
+    def _run_stage(self, pixels, function, radius, padding, parallel):
+        """Run one pass over the image, tile by tile on the pool when parallel."""
+        height, width = pixels.shape[:2]
+        size = self.tile_size
+        tiles = [(top, left) for top in range(0, height, size) for left in range(0, width, size)]
+        if not parallel or len(tiles) < 2 or self.max_workers < 2:
+            return function(self._padded(pixels, 0, height, 0, width, radius, padding))
+
+        result = np.empty_like(pixels)
+
+        def run_tile(tile):
+            top, left = tile
+            bottom, right = min(top + size, height), min(left + size, width)
+            result[top:bottom, left:right] = function(self._padded(pixels, top, bottom, left, right, radius, padding))
+
+        list(self._get_executor().map(run_tile, tiles))  # list() re-raises worker exceptions
+        return result
+
+    def apply(self, image, parallel=True):
+        """
+        Run the effects on an image.
+
+        Args:
+            image (PIL.Image): Source image; it is not modified
+            parallel (bool): Split the work into tiles on the thread pool (False runs the serial path)
+
+        Returns:
+            PIL.Image: RGBA result (RGB if the source was RGB); an empty image is returned as an unchanged copy
+        """
+        if not image.width or not image.height:
+            return image.copy()  # Nothing to filter, and edge padding needs at least one pixel
+        pixels = np.asarray(image.convert("RGBA") if image.mode != "RGBA" else image)
+        for function, radius, padding in self._stages():
+            pixels = self._run_stage(pixels, function, radius, padding, parallel)
+        result = Image.fromarray(np.ascontiguousarray(pixels), "RGBA")
+        return result.convert("RGB") if image.mode == "RGB" else result
+
+    def __call__(self, image):
+        return self.apply(image)
+
+    def shutdown(self):
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def _run_points(effects, pixels):
+    """Run a fused run of point-wise effects over one tile."""
+    for effect in effects:
+        pixels = effect(pixels)
+    return pixels
@@ -1,11 +1,17 @@
 
+import copy
+import math
 import pygame
 
+from utils.raster_buffer import SharedRaster
+
 class ImageModel:
     """Class representing an uploaded image as an editable object."""
+    THUMBNAIL_SIZE = 64  # The mip pyramid stops once a level's longer side is at most this many pixels
+
     def __init__(self, file_path, x=0, y=0):
         # Load image from file path using Pygame for rendering compatibility
-        self.image = pygame.image.load(file_path).convert_alpha()
+        self._raster = SharedRaster(pygame.image.load(file_path).convert_alpha())  # Copy-on-write pixels
         self.file_path = file_path  # Store file path for reference
         self.x = x  # Initial x position
         self.y = y  # Initial y position
@@ -13,6 +19,62 @@ class ImageModel:
         self.rotation = 0  # Initial rotation angle (degrees)
         self.selected = False  # Selection state
         self.dragging = False  # Dragging state
+        self._pyramid = [self.image]  # Mip levels generated so far; level n is downscaled by 2**n
+        self._scaled = None  # (scale, surface) of the last get_scaled_image() call
+
+    @property
+    def image(self):
+        """Full-resolution pixels; they may be shared with duplicates, so draw through get_writable_image()."""
+        return self._raster.read()
+
+    def get_writable_image(self):
+        """Return full-resolution pixels safe to modify in place, copying them first if a duplicate shares them."""
+        image = self._raster.write()
+        self._pyramid = [image]  # The caller is about to change the pixels the mip levels came from
+        self._scaled = None
+        return image
+
+    def duplicate(self):
+        """Return a copy of this image object that shares the pixels and mip levels until either side writes."""
+        clone = copy.copy(self)
+        clone._raster = self._raster.share()
+        clone._pyramid = list(self._pyramid)
+        return clone
+
+    def set_image(self, image):
+        """Replace the pixel data (e.g. after a flip or filter), dropping the stale mip levels."""
+        self._raster = SharedRaster(image)
+        self.width, self.height = image.get_size()
+        self._pyramid = [image]
+        self._scaled = None
+
+    def get_mip_level(self, level):
+        """Return mip level n (the image halved n times), generating the missing levels on demand."""
+        pyramid = self._pyramid
+        while len(pyramid) <= level:
+            previous = pyramid[-1]
+            width, height = previous.get_size()
+            if max(width, height) <= self.THUMBNAIL_SIZE:
+                break  # Smallest level reached
+            pyramid.append(pygame.transform.smoothscale(previous, (max(1, width // 2), max(1, height // 2))))
+        return pyramid[min(level, len(pyramid) - 1)]
+
+    def get_image_for_scale(self, scale):
+        """Return the smallest mip level with at least the resolution needed to draw at the given zoom scale."""
+        if scale >= 1:
+            return self.image
+        level = int(math.floor(math.log2(1 / max(scale, 1e-6))))
+        return self.get_mip_level(level)
+
+    def get_scaled_image(self, scale):
+        """Return the image resampled to a zoom scale from its nearest mip level, cached until the zoom changes."""
+        if self._scaled is None or self._scaled[0] != scale:
+            source = self.get_image_for_scale(scale)
+            size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+            if source.get_size() != size:
+                source = pygame.transform.smoothscale(source, size)
+            self._scaled = (scale, source)
+        return self._scaled[1]
 
     def move(self, dx, dy):
         """Move the image by dx, dy."""
@@ -1,4 +1,153 @@
+import bisect
+
+
 class LayerList:
+    """Id-keyed layer store that keeps layers sorted by their order key (bottom to top).
+
+    Alongside the full ordering it maintains the visible subset incrementally and a generation
+    counter that changes whenever anything in the document does, so renderers can skip unchanged frames.
+    """
+
     def __init__(self):
         """Initialize a project with an empty list of layers."""
-        self.layers = []  # List of LayerModel instances
\ No newline at end of file
+        self._layers = {}  # Layer id -> LayerModel
+        self._keys = []  # Sorted (order, id) pairs; orders are sparse, so reordering never renumbers
+        self._visible_keys = []  # Sorted (order, id) pairs of visible layers
+        self._snapshots = None  # Cached (all, visible) tuples; None after membership, order or visibility changes
+        self.generation = 0  # Bumped on every change, including geometry changes reported through touch()
+
+    @property
+    def layers(self):
+        """Return the layers bottom to top as a read-only tuple; change them with append/remove on the list itself."""
+        return self.ordered()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, layer):
+        return self._layers.get(getattr(layer, 'id', None)) is layer
+
+    def __iter__(self):
+        layers = self._layers
+        return (layers[layer_id] for _, layer_id in self._keys)
+
+    def __reversed__(self):
+        layers = self._layers
+        return (layers[layer_id] for _, layer_id in reversed(self._keys))
+
+    def __getitem__(self, index):
+        return self._layers[self._keys[index][1]]
+
+    def get(self, layer_id):
+        """Return the layer with the given id, or None."""
+        return self._layers.get(layer_id)
+
+    def index(self, layer):
+        """Return the position of the layer from the bottom."""
+        if layer not in self:
+            raise ValueError(f"{layer!r} is not in the layer list")
+        return bisect.bisect_left(self._keys, (layer.order, layer.id))
+
+    def append(self, layer):
+        """Add a layer on top of all others."""
+        if layer in self:
+            return
+        layer.order = self._keys[-1][0] + 1 if self._keys else 0
+        self._layers[layer.id] = layer
+        self._keys.append((layer.order, layer.id))
+        if layer.visible:
+            self._visible_keys.append((layer.order, layer.id))
+        self._changed()
+
+    def remove(self, layer):
+        """Remove a layer; the remaining layers keep their order keys."""
+        self._discard_visible(layer)
+        del self._keys[self.index(layer)]
+        del self._layers[layer.id]
+        self._changed()
+
+    def move_to_top(self, layer):
+        """Give the layer an order key above every other layer."""
+        was_visible = self._discard_visible(layer)
+        del self._keys[self.index(layer)]
+        layer.order = self._keys[-1][0] + 1 if self._keys else 0
+        self._keys.append((layer.order, layer.id))
+        if was_visible:
+            self._visible_keys.append((layer.order, layer.id))
+        self._changed()
+
+    def move_to_bottom(self, layer):
+        """Give the layer an order key below every other layer."""
+        was_visible = self._discard_visible(layer)
+        del self._keys[self.index(layer)]
+        layer.order = self._keys[0][0] - 1 if self._keys else 0
+        self._keys.insert(0, (layer.order, layer.id))
+        if was_visible:
+            self._visible_keys.insert(0, (layer.order, layer.id))
+        self._changed()
+
+    def swap_with_neighbour(self, layer, step):
+        """Swap the layer with the one directly above (step=1) or below (step=-1); returns False at the ends."""
+        idx = self.index(layer)
+        other_idx = idx + step
+        if not 0 <= other_idx < len(self._keys):
+            return False
+        other = self._layers[self._keys[other_idx][1]]
+        layer_visible = self._discard_visible(layer)
+        other_visible = self._discard_visible(other)
+        layer.order, other.order = other.order, layer.order
+        self._keys[idx] = (other.order, other.id)
+        self._keys[other_idx] = (layer.order, layer.id)
+        if layer_visible:
+            bisect.insort(self._visible_keys, (layer.order, layer.id))
+        if other_visible:
+            bisect.insort(self._visible_keys, (other.order, other.id))
+        self._changed()
+        return True
+
+    def set_visible(self, layer, visible):
+        """Show or hide a layer, keeping the visible ordering in sync."""
+        if layer not in self or layer.visible == visible:
+            return
+        layer.visible = visible
+        if visible:
+            bisect.insort(self._visible_keys, (layer.order, layer.id))
+        else:
+            self._discard_visible(layer)
+        self._changed()
+
+    def touch(self):
+        """Record a change that does not affect ordering or visibility (e.g. a layer moved)."""
+        self.generation += 1
+
+    def ordered(self):
+        """Return all layers bottom to top as a tuple, cached until the ordering changes."""
+        return self._get_snapshots()[0]
+
+    def visible(self):
+        """Return the visible layers bottom to top as a tuple, cached until the ordering changes."""
+        return self._get_snapshots()[1]
+
+    def _get_snapshots(self):
+        """Return the (all, visible) tuples, rebuilding them after a structural change."""
+        if self._snapshots is None:
+            layers = self._layers
+            self._snapshots = (
+                tuple(layers[layer_id] for _, layer_id in self._keys),
+                tuple(layers[layer_id] for _, layer_id in self._visible_keys),
+            )
+        return self._snapshots
+
+    def _discard_visible(self, layer):
+        """Drop the layer from the visible ordering; returns whether it was there."""
+        key = (layer.order, layer.id)
+        pos = bisect.bisect_left(self._visible_keys, key)
+        if pos < len(self._visible_keys) and self._visible_keys[pos] == key:
+            del self._visible_keys[pos]
+            return True
+        return False
+
+    def _changed(self):
+        """Invalidate the cached views after a membership, order or visibility change."""
+        self._snapshots = None
+        self.generation += 1
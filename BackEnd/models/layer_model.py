@@ -1,5 +1,5 @@
 # models/layer_model.py
-from utils.geometry_utils import is_point_inside
+from utils.geometry_utils import make_transform, invert_transform, apply_transform, transform_bounds
 
 class LayerModel:
     def __init__(self, obj, name=None):
@@ -17,15 +17,18 @@ class LayerModel:
         self.order = 0  # Order for rendering (higher order = drawn on top)
         self.selected = False  # Selection state
         self.dragging = False  # Dragging state
+        self._transform_cache = None  # (transform, inverse, bounds); None when geometry changed
 
     def move(self, dx, dy):
         """Move the layer by a specified offset."""
         self.x += dx
         self.y += dy
+        self._transform_cache = None
 
     def rotate(self, angle):
         """Rotate the layer by a specified angle."""
         self.rotation = (self.rotation + angle) % 360
+        self._transform_cache = None
 
     def resize(self, width, height, x=None, y=None):
         """Resize the layer to new dimensions, optionally updating position."""
@@ -35,7 +38,44 @@ class LayerModel:
             self.x = x
         if y is not None:
             self.y = y
+        self._transform_cache = None
+
+    def invalidate_transform(self):
+        """Drop the cached transform; call after assigning x, y, width, height or rotation directly."""
+        self._transform_cache = None
+
+    def _get_transform_cache(self):
+        """Return the cached (transform, inverse, bounds), rebuilding it if the geometry changed."""
+        if self._transform_cache is None:
+            transform = make_transform(self.x, self.y, self.rotation)
+            self._transform_cache = (
+                transform,
+                invert_transform(transform),
+                transform_bounds(transform, self.width, self.height),
+            )
+        return self._transform_cache
+
+    def get_transform(self):
+        """Return the affine transform from layer-local to canvas coordinates."""
+        return self._get_transform_cache()[0]
+
+    def get_inverse_transform(self):
+        """Return the affine transform from canvas to layer-local coordinates."""
+        return self._get_transform_cache()[1]
+
+    def get_bounds(self):
+        """Return the axis-aligned bounds (min_x, min_y, max_x, max_y) of the rotated layer."""
+        return self._get_transform_cache()[2]
+
+    def get_center(self):
+        """Return the canvas position of the layer's center."""
+        return apply_transform(self.get_transform(), self.width / 2, self.height / 2)
+
+    def to_local(self, x, y):
+        """Map a canvas point into the layer's unrotated frame."""
+        return apply_transform(self.get_inverse_transform(), x, y)
 
     def is_point_inside(self, mouse_x, mouse_y):
         """Check if a point is inside the layer, accounting for rotation."""
-        return is_point_inside(self.x, self.y, self.width, self.height, self.rotation, mouse_x, mouse_y)
\ No newline at end of file
+        local_x, local_y = self.to_local(mouse_x, mouse_y)
+        return 0 <= local_x <= self.width and 0 <= local_y <= self.height
@@ -1,5 +1,9 @@
-import copy
+import math
+
+import numpy as np
 from PIL import Image, ImageOps, ImageDraw
+from filters import basic_fillters
+from utils.raster_buffer import SharedRaster
 
 
 class ImageTool:
@@ -11,71 +15,226 @@ class ImageTool:
         self.y = y  # Y-coordinate on canvas
         self.width = width  # Width of the image
         self.height = height  # Height of the image
-        
+
         # Create a blank RGBA image as the default
-        self.original_image = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-        self.current_image = copy.deepcopy(self.original_image)
-        
+        self._original = SharedRaster(Image.new('RGBA', (width, height), (255, 255, 255, 0)))
+
+        # Edits are recorded as an operation stack and applied to the source image on demand.
+        # Consecutive geometric operations are composed into one affine matrix, so they resample once.
+        self._source = self._original.share()  # Copy-on-write handle on the image the operation stack starts from
+        self._ops = []  # ("affine", kind, params) or ("pixel", function, args) entries
+        self._result = None  # Memoized result of the current stack
+        self.resample = Image.Resampling.NEAREST  # Filter used for the composed resample (as rotate() used)
+
         self.rotation = 0  # Rotation angle in degrees
         self.selected = False  # Flag to indicate if image is selected
         self.dragging = False  # Flag to indicate if image is being dragged
-    
+
+    @property
+    def original_image(self):
+        """Image the tool started from; shared with the edited image, so it must not be modified in place"""
+        return self._original.read()
+
+    @property
+    def current_image(self):
+        """Image with every recorded operation applied (computed on first access after an edit); read-only"""
+        if self._result is None:
+            self._result = self._render()
+        return self._result
+
+    @current_image.setter
+    def current_image(self, image):
+        """Replace the edited image; the operation stack restarts from it"""
+        self._source = self._original.share() if image is self._original.read() else SharedRaster(image)
+        self._ops = []
+        self._result = image
+
+    def get_writable_image(self):
+        """Return the edited image for drawing on in place, copying it first if the original still shares it"""
+        image = self.current_image
+        if image is self._source.read():
+            self._ops = []  # Whatever is left on the stack does not change the pixels
+        else:
+            self.current_image = image  # Bake the operation stack into a new source
+        self._result = self._source.write()
+        return self._result
+
+    def _push(self, kind, operation, *params):
+        """Record an operation and drop the memoized result"""
+        self._ops.append((kind, operation, params))
+        self._result = None
+
     def flip_horizontal(self):
         """Flip image horizontally"""
-        self.current_image = ImageOps.mirror(self.current_image)
-    
+        self._push("affine", "flip_horizontal")
+
     def flip_vertical(self):
         """Flip image vertically"""
-        self.current_image = ImageOps.flip(self.current_image)
-    
+        self._push("affine", "flip_vertical")
+
     def rotate(self, angle):
         """Rotate image by given angle"""
         self.rotation = (self.rotation + angle) % 360
-        self.current_image = self.current_image.rotate(angle, expand=True)
-    
+        self._push("affine", "rotate", angle)
+
+    def scale(self, scale_x, scale_y=None):
+        """Scale image by the given factors"""
+        self._push("affine", "scale", scale_x, scale_x if scale_y is None else scale_y)
+
     def round_corners(self, radius):
         """Round image corners"""
-        mask = Image.new("L", self.current_image.size, 0)
+        self._push("pixel", self._round_corners, radius)
+
+    def _round_corners(self, image, radius):
+        """Return a copy of image with transparent rounded corners"""
+        mask = Image.new("L", image.size, 0)
         draw = ImageDraw.Draw(mask)
-        draw.rounded_rectangle((0, 0, self.current_image.width, self.current_image.height), 
+        draw.rounded_rectangle((0, 0, image.width, image.height),
                                 radius=radius, fill=255)
-        
-        result = self.current_image.copy()
+
+        result = image.copy()
         if result.mode != 'RGBA':
             result = result.convert('RGBA')
-        
-        background = Image.new('RGBA', self.current_image.size, (255, 255, 255, 0))
-        self.current_image = Image.composite(result, background, mask)
-    
+
+        background = Image.new('RGBA', image.size, (255, 255, 255, 0))
+        return Image.composite(result, background, mask)
+
     def add_border(self, border_size, border_color):
         """Add border to image"""
-        self.current_image = ImageOps.expand(
-            self.current_image, 
-            border=border_size, 
-            fill=border_color
-        )
-    
+        self._push("pixel", ImageOps.expand, border_size, border_color)
+
     def adjust_transparency(self, alpha):
         """Adjust image transparency"""
-        img = self.current_image.convert("RGBA")
-        new_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        pixels = img.load()
-        new_pixels = new_img.load()
-        
-        for x in range(img.width):
-            for y in range(img.height):
-                r, g, b, _ = pixels[x, y]
-                new_pixels[x, y] = (r, g, b, alpha)
-        
-        self.current_image = new_img
-    
+        self._push("pixel", basic_fillters.set_alpha, alpha)
+
+    def adjust_brightness(self, factor):
+        """Adjust image brightness (1.0 keeps it unchanged)"""
+        self._push("pixel", basic_fillters.adjust_brightness, factor)
+
+    def adjust_contrast(self, factor):
+        """Adjust image contrast (1.0 keeps it unchanged)"""
+        self._push("pixel", basic_fillters.adjust_contrast, factor)
+
+    def adjust_saturation(self, factor):
+        """Adjust image saturation (1.0 keeps it unchanged)"""
+        self._push("pixel", basic_fillters.adjust_saturation, factor)
+
+    def invert_colors(self):
+        """Invert image colors"""
+        self._push("pixel", basic_fillters.invert)
+
+    def to_grayscale(self):
+        """Convert image colors to grayscale"""
+        self._push("pixel", basic_fillters.grayscale)
+
+    def apply_effects(self, pipeline):
+        """Run a filters.effects.EffectsPipeline (blur, sharpen, shadow, ...) on the image"""
+        self._push("pixel", pipeline.apply)
+
     def crop(self, box):
         """Crop image based on given box coordinates"""
-        self.current_image = self.current_image.crop(box)
-    
+        self._push("affine", "crop", *box)
+
     def reset_to_original(self):
         """Reset image to its original state"""
-        self.current_image = copy.deepcopy(self.original_image)
-    
+        self._source = self._original.share()  # O(1): the pixels are only copied if someone writes to them
+        self._ops = []
+        self._result = None
+
+    def _render(self):
+        """Apply the operation stack to the source image, resampling once per run of geometric operations"""
+        image = self._source.read()
+        matrix = np.identity(3)  # Maps source pixel coordinates to the current frame
+        size = image.size
+        corners = self._rect_corners(size)  # Where the source content sits in the current frame
+        for kind, operation, params in self._ops:
+            if kind == "affine":
+                step, size, corners = self._affine_step(operation, params, size, corners)
+                matrix = step @ matrix
+                if operation == "crop":
+                    # A crop ends the run: later rotations and scales must not sample the pixels it removed
+                    image = self._resample(image, matrix, size)
+                    matrix = np.identity(3)
+            else:
+                image = self._resample(image, matrix, size)
+                image = operation(image, *params)
+                matrix = np.identity(3)
+                size = image.size
+                corners = self._rect_corners(size)
+        return self._resample(image, matrix, size)
+
+    @staticmethod
+    def _rect_corners(size):
+        """Return the corners of a (width, height) frame as a 3x4 array of homogeneous columns"""
+        width, height = size
+        return np.array([[0, width, width, 0], [0, 0, height, height], [1, 1, 1, 1]], dtype=float)
+
+    @staticmethod
+    def _affine_step(operation, params, size, corners):
+        """Return (matrix, new frame size, new content corners) for one geometric operation"""
+        width, height = size
+        if operation == "flip_horizontal":
+            step = np.array([[-1, 0, width], [0, 1, 0], [0, 0, 1]], dtype=float)
+        elif operation == "flip_vertical":
+            step = np.array([[1, 0, 0], [0, -1, height], [0, 0, 1]], dtype=float)
+        elif operation == "scale":
+            scale_x, scale_y = params
+            step = np.array([[scale_x, 0, 0], [0, scale_y, 0], [0, 0, 1]], dtype=float)
+            size = (max(1, round(width * scale_x)), max(1, round(height * scale_y)))
+        elif operation == "crop":
+            left, top, right, bottom = (int(round(value)) for value in params)  # Rounded like Image.crop
+            step = np.array([[1, 0, -left], [0, 1, -top], [0, 0, 1]], dtype=float)
+            size = (right - left, bottom - top)
+            return step, size, ImageTool._rect_corners(size)  # The frame now bounds what is visible
+        else:
+            # Counter-clockwise about the frame center with expand=True, like Image.rotate
+            angle = math.radians(params[0])
+            cos_a = round(math.cos(angle), 15)
+            sin_a = round(math.sin(angle), 15)
+            center_x, center_y = width / 2, height / 2
+            step = np.array([
+                [cos_a, sin_a, center_x - cos_a * center_x - sin_a * center_y],
+                [-sin_a, cos_a, center_y + sin_a * center_x - cos_a * center_y],
+                [0, 0, 1],
+            ])
+            if params[0] % 90 == 0:
+                # Quarter turns transpose the frame exactly, like Image.rotate does for them
+                frame = step @ ImageTool._rect_corners(size)
+                step[0, 2] -= frame[0].min()
+                step[1, 2] -= frame[1].min()
+                size = (width, height) if params[0] % 180 == 0 else (height, width)
+                return step, size, step @ corners
+            rotated = step @ corners
+            new_width = ImageTool._ceil(rotated[0].max()) - ImageTool._floor(rotated[0].min())
+            new_height = ImageTool._ceil(rotated[1].max()) - ImageTool._floor(rotated[1].min())
+            # Keep the rotation center at the center of the expanded frame
+            step[0, 2] += (new_width - width) / 2
+            step[1, 2] += (new_height - height) / 2
+            size = (new_width, new_height)
+        return step, size, step @ corners
+
+    @staticmethod
+    def _ceil(value, epsilon=1e-6):
+        """math.ceil that ignores floating-point error left by composing matrices (30.0000001 stays 30)"""
+        nearest = round(value)
+        return nearest if abs(value - nearest) < epsilon else math.ceil(value)
+
+    @staticmethod
+    def _floor(value, epsilon=1e-6):
+        """math.floor that ignores floating-point error left by composing matrices (29.9999999 stays 30)"""
+        nearest = round(value)
+        return nearest if abs(value - nearest) < epsilon else math.floor(value)
 
-    
+    def _resample(self, image, matrix, size):
+        """Resample an image once through a composed source-to-frame matrix"""
+        if np.allclose(matrix, np.identity(3)) and size == image.size:
+            return image
+        inverse = np.linalg.inv(matrix)  # Image.transform maps output pixels back to the source
+        data = inverse[:2].ravel()
+        rounded = np.round(data, 9)
+        resample = self.resample
+        if np.isin(rounded[[0, 1, 3, 4]], (-1, 0, 1)).all() and (rounded[[2, 5]] == np.floor(rounded[[2, 5]])).all():
+            # Pure flips, quarter turns and crops copy pixels exactly
+            data = rounded
+            resample = Image.Resampling.NEAREST
+        return image.transform(size, Image.Transform.AFFINE, tuple(data.tolist()), resample=resample)
@@ -0,0 +1,111 @@
+# tools/raster_pool.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import pygame
+
+_shape_tool = None  # Per-worker ShapeTool, created on the first shape job
+
+
+def _export(data, size):
+    """Copy raster bytes into a new shared-memory block that the parent process will read and unlink."""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    shm.buf[:len(data)] = data
+    name = shm.name
+    shm.close()
+    if os.name == "posix":
+        # The parent owns the block from here on; stop this process's tracker from unlinking it
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return name, size
+
+
+def _import(name, size, reader):
+    """Read a worker's shared-memory block with reader(buffer, size), then free the block."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return reader(shm.buf[:size[0] * size[1] * 4], size)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _get_shape_tool():
+    """Return this process's uncached ShapeTool."""
+    global _shape_tool
+    if _shape_tool is None:
+        from BackEnd.tools.shape_tool import ShapeTool
+        _shape_tool = ShapeTool(cache_budget=0)
+    return _shape_tool
+
+
+def _render_shape_job(args):
+    """Worker: rasterize one shape with ShapeTool.rasterize and export its RGBA pixels."""
+    surface = _get_shape_tool().rasterize(*args)
+    name, size = _export(pygame.image.tobytes(surface, "RGBA"), surface.get_size())
+    return name, size, surface.get_alpha()
+
+
+def _surface_from_buffer(buffer, size):
+    """Build a pygame surface owning a copy of RGBA pixels from a shared buffer."""
+    view = pygame.image.frombuffer(buffer, size, "RGBA")
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    # max() against the zeroed surface copies every channel exactly instead of alpha-blending
+    surface.blit(view, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+    del view  # Releases the buffer so the block can be closed
+    return surface
+
+
+class RasterPool:
+    """
+    Process pool that rasterizes shape layers in parallel.
+    Workers write pixels into shared-memory blocks; the main thread only copies them out and composites.
+    """
+
+    def __init__(self, max_workers=None, min_batch=8):
+        """
+        Initialize the pool; worker processes start on first use.
+
+        Args:
+            max_workers (int): Number of worker processes (default: one per CPU core)
+            min_batch (int): Smaller batches are rendered in-process, where IPC would cost more than it saves
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_batch = min_batch
+        self._executor = None
+
+    def _get_executor(self):
+        """Create the worker processes on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _chunksize(self, count):
+        """Spread jobs evenly, a few chunks per worker."""
+        return max(1, count // (self.max_workers * 4))
+
+    def render_shapes(self, shapes):
+        """
+        Rasterize shapes in parallel.
+
+        Args:
+            shapes (list): Argument tuples for ShapeTool.rasterize
+
+        Returns:
+            list: Rendered pygame surfaces, in the same order
+        """
+        if len(shapes) < self.min_batch:
+            shape_tool = _get_shape_tool()
+            return [shape_tool.rasterize(*args) for args in shapes]
+        results = []
+        for name, size, alpha in self._get_executor().map(_render_shape_job, shapes, chunksize=self._chunksize(len(shapes))):
+            surface = _import(name, size, _surface_from_buffer)
+            surface.set_alpha(alpha)
+            results.append(surface)
+        return results
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,164 @@
+# tools/selection_tool.py
+from utils.geometry_utils import bounds_overlap, is_point_in_polygon
+
+
+class SelectionSet:
+    """Ordered set of selected layers that keeps each layer's `selected` flag in sync."""
+
+    def __init__(self):
+        """Initialize an empty selection."""
+        self._layers = {}  # Layer id -> layer, in selection order
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __contains__(self, layer):
+        return self._layers.get(getattr(layer, 'id', None)) is layer
+
+    def __iter__(self):
+        return iter(list(self._layers.values()))
+
+    @property
+    def primary(self):
+        """Return the most recently selected layer, or None."""
+        return next(reversed(self._layers.values()), None)
+
+    def add(self, layer):
+        """Add a layer to the selection."""
+        if layer not in self:
+            self._layers[layer.id] = layer
+            layer.selected = True
+
+    def remove(self, layer):
+        """Remove a layer from the selection; unselected layers are ignored."""
+        if layer in self:
+            del self._layers[layer.id]
+            layer.selected = False
+
+    def toggle(self, layer):
+        """Add the layer if it is not selected, otherwise remove it."""
+        if layer in self:
+            self.remove(layer)
+        else:
+            self.add(layer)
+
+    def clear(self):
+        """Deselect every layer."""
+        for layer in self._layers.values():
+            layer.selected = False
+        self._layers.clear()
+
+    def replace(self, layers):
+        """Make the selection exactly the given layers, only touching flags that change."""
+        new_layers = {layer.id: layer for layer in layers}
+        for layer_id, layer in self._layers.items():
+            if layer_id not in new_layers:
+                layer.selected = False
+        for layer in new_layers.values():
+            layer.selected = True
+        self._layers = new_layers
+
+    def get_bounds(self):
+        """Return the combined (min_x, min_y, max_x, max_y) bounds of the selection, or None if empty."""
+        if not self._layers:
+            return None
+        boxes = [layer.get_bounds() for layer in self._layers.values()]
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+class SelectionTool:
+    """Rectangle and lasso marquee selection over a LayerController's spatial index."""
+
+    # Selection modes: replace the selection, add to it (shift) or toggle hits in and out of it
+    REPLACE = "replace"
+    ADD = "add"
+    TOGGLE = "toggle"
+
+    def __init__(self, layer_controller):
+        """Initialize the tool with the LayerController whose layers and selection it edits."""
+        self.layer_controller = layer_controller
+        self.selection = layer_controller.selection
+        self.active = False  # True while a marquee is being dragged
+        self.lasso = False  # Lasso instead of rectangle marquee
+        self.mode = self.REPLACE
+        self.points = []  # Marquee corners, or lasso vertices
+        self._base = ()  # Selection when the marquee started, for add/toggle modes
+
+    def begin(self, x, y, lasso=False, mode=REPLACE):
+        """Start a rectangle (or lasso) marquee at (x, y)."""
+        self.active = True
+        self.lasso = lasso
+        self.mode = mode
+        self.points = [(x, y), (x, y)] if not lasso else [(x, y)]
+        self._base = tuple(self.selection) if mode != self.REPLACE else ()
+        self._apply(self._hits())
+
+    def update(self, x, y):
+        """Extend the marquee to (x, y) and update the selection."""
+        if not self.active:
+            return
+        if self.lasso:
+            self.points.append((x, y))
+        else:
+            self.points[1] = (x, y)
+        self._apply(self._hits())
+
+    def end(self):
+        """Finish the marquee and return the resulting selection."""
+        self.active = False
+        self.points = []
+        self._base = ()
+        return self.selection
+
+    def click(self, x, y, mode=REPLACE):
+        """Select the topmost layer under (x, y), honouring shift-add and toggle modes."""
+        layer = self.layer_controller.get_layer_at_point(x, y)
+        if mode == self.REPLACE:
+            self.selection.replace([layer] if layer else [])
+        elif layer is not None:
+            if mode == self.TOGGLE:
+                self.selection.toggle(layer)
+            else:
+                self.selection.add(layer)
+        self.layer_controller.selected_layer = self.selection.primary
+        return layer
+
+    def get_marquee_bounds(self):
+        """Return the (min_x, min_y, max_x, max_y) bounds of the current marquee, or None."""
+        if not self.points:
+            return None
+        xs = [px for px, _ in self.points]
+        ys = [py for _, py in self.points]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _hits(self):
+        """Return the selectable layers touched by the marquee, from the spatial index."""
+        bounds = self.get_marquee_bounds()
+        candidates = self.layer_controller.spatial_index.query_rect(*bounds)
+        hits = []
+        for layer in candidates:
+            if not layer.visible or layer.locked or not bounds_overlap(layer.get_bounds(), bounds):
+                continue
+            if self.lasso:
+                # Lasso selects layers whose center it encloses
+                if len(self.points) < 3 or not is_point_in_polygon(*layer.get_center(), self.points):
+                    continue
+            hits.append(layer)
+        hits.sort(key=lambda l: l.order)
+        return hits
+
+    def _apply(self, hits):
+        """Combine the marquee hits with the starting selection according to the mode."""
+        if self.mode == self.ADD:
+            hit_ids = {layer.id for layer in hits}
+            layers = [layer for layer in self._base if layer.id not in hit_ids] + hits
+        elif self.mode == self.TOGGLE:
+            hit_ids = {layer.id for layer in hits}
+            base_ids = {layer.id for layer in self._base}
+            layers = [layer for layer in self._base if layer.id not in hit_ids]
+            layers += [layer for layer in hits if layer.id not in base_ids]
+        else:
+            layers = hits
+        self.selection.replace(layers)
+        self.layer_controller.selected_layer = self.selection.primary
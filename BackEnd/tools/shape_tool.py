@@ -1,11 +1,12 @@
 # tools/shape_tool.py
 import pygame
 import math
+from collections import OrderedDict
 
 # Class to handle drawing various shapes on a surface
 class ShapeTool:
-    # Initialize with a dictionary of shape drawing handlers
-    def __init__(self):
+    # Initialize with a dictionary of shape drawing handlers and an LRU cache of rendered rasters
+    def __init__(self, cache_budget=64 * 1024 * 1024):
         self._draw_handlers = {
             "square": self._draw_square,
             "outline_square": self._draw_outline_square,
@@ -16,9 +17,88 @@ class ShapeTool:
             "line": self._draw_line,
              "star": self._draw_star,
         }
-    
-    # Draw a shape on the given surface with specified properties
-    def draw(self, surface, shape_type, width, height, line_color, line_thickness, fill_color=None, border_radius=0, alpha=255, rotation=0):
+        self.cache_budget = cache_budget  # Maximum bytes of cached rasters before LRU eviction
+        self.cache_bytes = 0  # Bytes currently held by the cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()  # Raster key -> rotated surface, least recently used first
+
+    # Draw a shape on the given surface with specified properties, reusing the cached raster when nothing changed
+    # A scale below 1 draws a low-res draft raster, upscaled with nearest-neighbour sampling
+    def draw(self, surface, shape_type, width, height, line_color, line_thickness, fill_color=None, border_radius=0, alpha=255, rotation=0, scale=1.0):
+        surface.blit(self.render(shape_type, width, height, line_color, line_thickness, fill_color, border_radius, alpha, rotation, scale), (0, 0))
+
+    # Return the rotated raster for a shape, from the cache or freshly rendered
+    def render(self, shape_type, width, height, line_color, line_thickness, fill_color=None, border_radius=0, alpha=255, rotation=0, scale=1.0):
+        key = self.cache_key(shape_type, width, height, line_color, line_thickness, fill_color, border_radius, alpha, rotation, scale)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)  # Mark as most recently used
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+        rendered = self.rasterize(shape_type, width, height, line_color, line_thickness, fill_color, border_radius, alpha, rotation, scale)
+        self._store(key, rendered)
+        return rendered
+
+    # Render the uncached rasters among many shapes at once on a RasterPool; returns how many were rendered
+    def prefetch(self, shapes, pool):
+        missing = {}
+        for args in shapes:
+            key = self.cache_key(*args)
+            if key not in self._cache and key not in missing:
+                missing[key] = args
+        if missing:
+            self.cache_misses += len(missing)
+            for key, rendered in zip(missing, pool.render_shapes(list(missing.values()))):
+                self._store(key, rendered)
+        return len(missing)
+
+    # Build the cache key of a shape raster
+    def cache_key(self, shape_type, width, height, line_color, line_thickness, fill_color=None, border_radius=0, alpha=255, rotation=0, scale=1.0):
+        return (shape_type, int(width), int(height), self._color_key(line_color), line_thickness,
+                self._color_key(fill_color), border_radius, alpha, rotation, scale)
+
+    # Add a raster to the cache, evicting the least recently used ones beyond the byte budget
+    def _store(self, key, rendered):
+        size = rendered.get_bytesize() * rendered.get_width() * rendered.get_height()
+        if size <= self.cache_budget:
+            self._cache[key] = rendered
+            self.cache_bytes += size
+            while self.cache_bytes > self.cache_budget:
+                _, evicted = self._cache.popitem(last=False)  # Drop the least recently used raster
+                self.cache_bytes -= evicted.get_bytesize() * evicted.get_width() * evicted.get_height()
+
+    # Drop every cached raster and reset the counters
+    def clear_cache(self):
+        self._cache.clear()
+        self.cache_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # Return cache statistics: entries, bytes, budget, hits and misses
+    def get_cache_stats(self):
+        return {
+            "entries": len(self._cache),
+            "bytes": self.cache_bytes,
+            "budget": self.cache_budget,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
+
+    # Colors may be tuples, lists or pygame.Color; normalize them into hashable tuples
+    @staticmethod
+    def _color_key(color):
+        return tuple(color) if color is not None else None
+
+    # Render a shape (as a draft when scale is below 1) without touching the cache
+    def rasterize(self, shape_type, width, height, line_color, line_thickness, fill_color=None, border_radius=0, alpha=255, rotation=0, scale=1.0):
+        if scale < 1:
+            return self._rasterize_draft(shape_type, width, height, line_color, line_thickness, fill_color, border_radius, alpha, rotation, scale)
+        return self._rasterize(shape_type, width, height, line_color, line_thickness, fill_color, border_radius, alpha, rotation)
+
+    # Render a shape onto a new surface and rotate it, bypassing the cache
+    def _rasterize(self, shape_type, width, height, line_color, line_thickness, fill_color, border_radius, alpha, rotation):
         temp_surface = pygame.Surface((width, height), pygame.SRCALPHA)  # Create a temporary surface with alpha support
         temp_surface.set_alpha(alpha)  # Set transparency level
 
@@ -26,8 +106,17 @@ class ShapeTool:
         if handler:
             handler(temp_surface, line_color, line_thickness, fill_color, border_radius)  # Call the handler to draw
 
-        rotated_surface = pygame.transform.rotate(temp_surface, rotation)  # Rotate the drawn shape
-        surface.blit(rotated_surface, (0, 0))  # Draw the rotated shape onto the main surface
+        return pygame.transform.rotate(temp_surface, rotation)  # Rotate the drawn shape
+
+    # Render a shape at a fraction of its size and blow it back up with nearest-neighbour sampling
+    def _rasterize_draft(self, shape_type, width, height, line_color, line_thickness, fill_color, border_radius, alpha, rotation, scale):
+        small = self._rasterize(
+            shape_type, max(1, round(width * scale)), max(1, round(height * scale)), line_color,
+            max(1, round(line_thickness * scale)) if line_thickness else 0, fill_color,
+            round(border_radius * scale), alpha, rotation
+        )
+        size = (max(1, round(small.get_width() / scale)), max(1, round(small.get_height() / scale)))
+        return pygame.transform.scale(small, size)  # Nearest-neighbour, unlike smoothscale
 
     # Draw a filled square with an optional border
     def _draw_square(self, surface, line_color, line_thickness, fill_color, border_radius):
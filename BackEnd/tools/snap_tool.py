@@ -0,0 +1,88 @@
+# tools/snap_tool.py
+import bisect
+
+
+class SnapEngine:
+    """Snaps a dragged box to other layers' edges and centers, the canvas center and a grid."""
+
+    def __init__(self, threshold=6, grid_size=None, canvas_size=None):
+        """
+        Initialize the snapping engine.
+
+        Args:
+            threshold (int): Maximum distance in pixels at which a snap happens
+            grid_size (int): Grid spacing to snap to, or None to disable grid snapping
+            canvas_size (tuple): (width, height) of the canvas, used for center guides
+        """
+        self.threshold = threshold
+        self.grid_size = grid_size
+        self.canvas_size = canvas_size
+        self._x_targets = []  # Sorted x positions of vertical snap lines
+        self._y_targets = []  # Sorted y positions of horizontal snap lines
+
+    def build(self, layers, exclude=()):
+        """Index the edges and centers of the given layers, skipping the ones being dragged."""
+        excluded = {layer.id for layer in exclude}
+        x_targets = []
+        y_targets = []
+        for layer in layers:
+            if layer.id in excluded:
+                continue
+            min_x, min_y, max_x, max_y = layer.get_bounds()
+            x_targets += (min_x, (min_x + max_x) / 2, max_x)
+            y_targets += (min_y, (min_y + max_y) / 2, max_y)
+        if self.canvas_size:
+            x_targets.append(self.canvas_size[0] / 2)
+            y_targets.append(self.canvas_size[1] / 2)
+        x_targets.sort()
+        y_targets.sort()
+        self._x_targets = x_targets
+        self._y_targets = y_targets
+
+    def clear(self):
+        """Drop the indexed snap lines."""
+        self._x_targets = []
+        self._y_targets = []
+
+    def _nearest(self, targets, value):
+        """Return the target closest to value, or None if the list is empty."""
+        pos = bisect.bisect_left(targets, value)
+        best = None
+        for i in (pos - 1, pos):
+            if 0 <= i < len(targets) and (best is None or abs(targets[i] - value) < abs(best - value)):
+                best = targets[i]
+        return best
+
+    def _snap_axis(self, targets, low, high):
+        """Return (offset, guide position) for the best snap of an axis span, or (0, None)."""
+        best_offset, best_guide = None, None
+        for value in (low, (low + high) / 2, high):
+            target = self._nearest(targets, value)
+            if target is not None and abs(target - value) <= self.threshold:
+                if best_offset is None or abs(target - value) < abs(best_offset):
+                    best_offset, best_guide = target - value, target
+        if self.grid_size:
+            target = round(low / self.grid_size) * self.grid_size
+            if abs(target - low) <= self.threshold and (best_offset is None or abs(target - low) < abs(best_offset)):
+                best_offset, best_guide = target - low, target
+        if best_offset is None:
+            return 0, None
+        return best_offset, best_guide
+
+    def snap(self, bounds):
+        """
+        Snap a box given by its (min_x, min_y, max_x, max_y) bounds.
+
+        Returns:
+            tuple: (dx, dy, guides) where dx, dy is the correction to apply and guides is a list of
+            ("vertical", x) / ("horizontal", y) lines for the UI to draw
+        """
+        min_x, min_y, max_x, max_y = bounds
+        dx, guide_x = self._snap_axis(self._x_targets, min_x, max_x)
+        dy, guide_y = self._snap_axis(self._y_targets, min_y, max_y)
+        guides = []
+        if guide_x is not None:
+            guides.append(("vertical", guide_x))
+        if guide_y is not None:
+            guides.append(("horizontal", guide_y))
+        return dx, dy, guides
@@ -1,5 +1,4 @@
 from PIL import Image, ImageDraw, ImageFont
-import copy
 import math
 
 
@@ -78,8 +77,9 @@ class TextTool:
                 fill=self.model.formatting['color'], width=2
             )
 
+        # Both start on the same pixels: rotate and the flips build new images rather than editing in place
         self.model.original_image = base_image
-        self.model.current_image = copy.deepcopy(base_image)
+        self.model.current_image = base_image
 
     def set_formatting(self, **kwargs):
         for key, value in kwargs.items():
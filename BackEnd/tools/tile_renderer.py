@@ -0,0 +1,161 @@
+# tools/tile_renderer.py
+from collections import OrderedDict
+
+import pygame
+
+from BackEnd.utils.spatial_index import SpatialGrid
+
+
+class TileRenderer:
+    """
+    Composites a document as fixed-size tiles that are cached until a layer over them changes.
+    Only tiles inside the viewport are rendered, and cached tiles are evicted least recently used
+    first, so memory follows the viewport rather than the document size.
+    """
+
+    def __init__(self, draw_layer, document_size, tile_size=256, max_tiles=96, background=(255, 255, 255, 0)):
+        """
+        Initialize the tile renderer.
+
+        Args:
+            draw_layer: Callback draw_layer(surface, layer, x, y) drawing a layer at (x, y) on a tile surface
+            document_size (tuple): (width, height) of the whole document in pixels
+            tile_size (int): Edge length of a square tile in pixels
+            max_tiles (int): Number of cached tiles kept beyond those visible in the current frame
+            background (tuple): RGBA color each tile is cleared to
+        """
+        self.draw_layer = draw_layer
+        self.document_rect = pygame.Rect((0, 0), document_size)
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.background = background
+        self._tiles = OrderedDict()  # (col, row) -> tile Surface, least recently used first
+        self._stale = set()  # Tiles rendered or changed since they were last composited to the target
+        self._layers = SpatialGrid(cell_size=tile_size)  # Layer id -> layer, bucketed by drawn rect
+        self._rects = {}  # Layer id -> document rect the layer covers
+        self.tiles_rendered = 0  # Tile renders since creation, for profiling
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def set_document_size(self, document_size):
+        """Resize the document; every cached tile is dropped."""
+        self.document_rect = pygame.Rect((0, 0), document_size)
+        self.clear()
+
+    def update_layer(self, layer, rect):
+        """Add or move a layer covering the given document rect, invalidating the tiles under both rects."""
+        self.remove_layer(layer)
+        rect = pygame.Rect(rect)
+        self._rects[layer.id] = rect
+        self._layers.insert(layer.id, layer, (rect.left, rect.top, rect.right - 1, rect.bottom - 1))
+        self.invalidate(rect)
+
+    def remove_layer(self, layer):
+        """Stop drawing a layer and invalidate the tiles it covered; unknown layers are ignored."""
+        rect = self._rects.pop(layer.id, None)
+        if rect is not None:
+            self._layers.remove(layer.id)
+            self.invalidate(rect)
+
+    def get_layer_rect(self, layer):
+        """Return the document rect recorded for a layer, or None."""
+        return self._rects.get(layer.id)
+
+    def layers_in(self, rect):
+        """Return the layers whose drawn rect overlaps a document rect."""
+        rect = pygame.Rect(rect)
+        layers = self._layers.query_rect(rect.left, rect.top, rect.right - 1, rect.bottom - 1)
+        return [layer for layer in layers if self._rects[layer.id].colliderect(rect)]
+
+    def invalidate(self, rect=None):
+        """Drop the cached tiles touching a document rect (or every tile by default)."""
+        if rect is None:
+            self.clear()
+            return
+        for key in self._tile_keys(pygame.Rect(rect)):
+            if self._tiles.pop(key, None) is not None:
+                self._stale.discard(key)
+
+    def clear(self):
+        """Drop every cached tile, keeping the layers."""
+        self._tiles.clear()
+        self._stale.clear()
+
+    def reset(self):
+        """Forget every layer and cached tile."""
+        self.clear()
+        self._layers.clear()
+        self._rects.clear()
+
+    def _tile_keys(self, rect):
+        """Return the (col, row) keys of the document tiles a rect touches."""
+        rect = rect.clip(self.document_rect)
+        if not rect.width or not rect.height:
+            return []
+        size = self.tile_size
+        return [(col, row)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for col in range(rect.left // size, (rect.right - 1) // size + 1)]
+
+    def _tile_rect(self, key):
+        """Return the document rect of a tile, clipped to the document."""
+        size = self.tile_size
+        return pygame.Rect(key[0] * size, key[1] * size, size, size).clip(self.document_rect)
+
+    def _render_tile(self, key):
+        """Composite the layers over one tile, bottom to top."""
+        tile_rect = self._tile_rect(key)
+        surface = pygame.Surface(tile_rect.size, pygame.SRCALPHA)
+        surface.fill(self.background)
+        layers = self._layers.query_rect(tile_rect.left, tile_rect.top, tile_rect.right - 1, tile_rect.bottom - 1)
+        for layer in sorted(layers, key=lambda l: l.order):
+            rect = self._rects[layer.id]
+            if rect.colliderect(tile_rect):
+                self.draw_layer(surface, layer, rect.x - tile_rect.x, rect.y - tile_rect.y)
+        self.tiles_rendered += 1
+        return surface
+
+    def render(self, target, viewport, full=False):
+        """
+        Bring the target surface up to date with the part of the document under the viewport.
+
+        Missing tiles are rendered, and only tiles that changed since they were last composited are
+        copied to the target, unless full is set (e.g. after the viewport scrolled).
+
+        Args:
+            target: Surface the viewport is shown on; its (0, 0) maps to the viewport's top-left
+            viewport: pygame.Rect of the document area shown on the target
+            full (bool): Recomposite every visible tile
+
+        Returns:
+            list: Target-space rects that were updated
+        """
+        viewport = pygame.Rect(viewport)
+        visible = self._tile_keys(viewport)
+        updated = []
+        for key in visible:
+            tile = self._tiles.get(key)
+            if tile is None:
+                tile = self._tiles[key] = self._render_tile(key)
+                self._stale.add(key)
+            else:
+                self._tiles.move_to_end(key)  # Mark as recently used
+            if not full and key not in self._stale:
+                continue
+            self._stale.discard(key)
+            tile_rect = self._tile_rect(key)
+            dest = tile_rect.move(-viewport.x, -viewport.y).clip(target.get_rect())
+            if not dest.width or not dest.height:
+                continue
+            # Copy the tile pixels exactly: max() against a zeroed area leaves the tile's values
+            target.fill((0, 0, 0, 0), dest)
+            area = dest.move(viewport.x - tile_rect.x, viewport.y - tile_rect.y)
+            target.blit(tile, dest, area, special_flags=pygame.BLEND_RGBA_MAX)
+            updated.append(dest)
+        # Keep the visible tiles plus up to max_tiles others
+        while len(self._tiles) > len(visible) + self.max_tiles:
+            key, _ = self._tiles.popitem(last=False)
+            self._stale.discard(key)
+        return updated
+
@@ -1,6 +1,11 @@
 # utils/geometry_utils.py
 import math
 
+import numpy as np
+
+# Resize handle names, in the priority order used by is_near_border
+HANDLE_NAMES = ("top-left", "top-right", "bottom-left", "bottom-right", "top", "left", "right", "bottom")
+
 def is_point_inside(x, y, width, height, rotation, mouse_x, mouse_y):
     """Check if a point (mouse_x, mouse_y) is inside a rectangle defined by (x, y, width, height) with rotation."""
     # Convert to local coordinates
@@ -51,4 +56,72 @@ def is_near_border(x, y, width, height, mouse_x, mouse_y, buffer=5, proximity_th
         if math.sqrt((mouse_x - proj_x) ** 2 + (mouse_y - proj_y) ** 2) < proximity_threshold:
             return True, name
 
-    return False, None
\ No newline at end of file
+    return False, None
+
+def make_transform(x, y, rotation):
+    """Return the affine (a, b, c, d, e, f) mapping layer-local points to the canvas: (a*lx + b*ly + c, d*lx + e*ly + f)."""
+    angle_rad = math.radians(rotation)
+    cos_a = math.cos(angle_rad)
+    sin_a = math.sin(angle_rad)
+    # Inverse of the rotation applied in is_point_inside
+    return (cos_a, sin_a, x, -sin_a, cos_a, y)
+
+def invert_transform(transform):
+    """Return the inverse of an affine (a, b, c, d, e, f) transform."""
+    a, b, c, d, e, f = transform
+    det = a * e - b * d
+    inv_a, inv_b = e / det, -b / det
+    inv_d, inv_e = -d / det, a / det
+    return (inv_a, inv_b, -(inv_a * c + inv_b * f), inv_d, inv_e, -(inv_d * c + inv_e * f))
+
+def apply_transform(transform, x, y):
+    """Map the point (x, y) through an affine (a, b, c, d, e, f) transform."""
+    a, b, c, d, e, f = transform
+    return a * x + b * y + c, d * x + e * y + f
+
+def transform_bounds(transform, width, height):
+    """Return the axis-aligned bounds (min_x, min_y, max_x, max_y) of a width x height local rectangle after transform."""
+    corners = [apply_transform(transform, cx, cy) for cx, cy in ((0, 0), (width, 0), (0, height), (width, height))]
+    xs = [cx for cx, _ in corners]
+    ys = [cy for _, cy in corners]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def get_rotated_bounds(x, y, width, height, rotation):
+    """Return the axis-aligned bounds (min_x, min_y, max_x, max_y) of a rectangle rotated about (x, y)."""
+    return transform_bounds(make_transform(x, y, rotation), width, height)
+
+def bounds_overlap(bounds_a, bounds_b):
+    """Check if two (min_x, min_y, max_x, max_y) bounds overlap."""
+    return (bounds_a[0] <= bounds_b[2] and bounds_b[0] <= bounds_a[2] and
+            bounds_a[1] <= bounds_b[3] and bounds_b[1] <= bounds_a[3])
+
+def is_point_in_polygon(x, y, points):
+    """Check if (x, y) lies inside the polygon given by its (x, y) vertices, using the even-odd rule."""
+    inside = False
+    prev_x, prev_y = points[-1]
+    for cur_x, cur_y in points:
+        if (cur_y > y) != (prev_y > y) and x < (prev_x - cur_x) * (y - cur_y) / (prev_y - cur_y) + cur_x:
+            inside = not inside
+        prev_x, prev_y = cur_x, cur_y
+    return inside
+
+def _to_local_frames(rects, points):
+    """Map points into every rectangle's unrotated frame; returns (local_x, local_y, width, height) arrays of shape (N, M)."""
+    rects = np.asarray(rects, dtype=float).reshape(-1, 5)
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    x, y, width, height, rotation = (rects[:, i:i + 1] for i in range(5))
+    angle_rad = np.radians(-rotation)
+    cos_a = np.cos(angle_rad)
+    sin_a = np.sin(angle_rad)
+    offset_x = points[:, 0] - x
+    offset_y = points[:, 1] - y
+    local_x = offset_x * cos_a + offset_y * sin_a
+    local_y = -offset_x * sin_a + offset_y * cos_a
+    return local_x, local_y, width, height
+
+def points_inside_rects(rects, points):
+    """Vectorized is_point_inside: rects are (x, y, width, height, rotation) rows, points one (x, y) or an (M, 2) array.
+    Returns a boolean mask shaped (N,) for a single point, otherwise (N, M)."""
+    local_x, local_y, width, height = _to_local_frames(rects, points)
+    mask = (local_x >= 0) & (local_x <= width) & (local_y >= 0) & (local_y <= height)
+    return mask[:, 0] if np.ndim(points) == 1 else mask
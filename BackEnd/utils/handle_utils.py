@@ -0,0 +1,110 @@
+# utils/handle_utils.py
+from utils.geometry_utils import HANDLE_NAMES, apply_transform
+
+# Sides moved by each handle as (horizontal, vertical): -1 = left/top, 1 = right/bottom, 0 = unchanged
+RESIZE_SIDES = {
+    "top-left": (-1, -1),
+    "top-right": (1, -1),
+    "bottom-left": (-1, 1),
+    "bottom-right": (1, 1),
+    "top": (0, -1),
+    "left": (-1, 0),
+    "right": (1, 0),
+    "bottom": (0, 1),
+}
+
+
+def resize_from_handle(handle, original_size, local_x, local_y, buffer=5):
+    """Return (width, height, left, top) in the layer's original local frame for a handle dragged to (local_x, local_y)."""
+    horizontal, vertical = RESIZE_SIDES[handle]
+    width, height = original_size
+    left = top = 0
+    if horizontal < 0:
+        left = local_x - buffer
+        width -= left
+    elif horizontal > 0:
+        width = local_x
+    if vertical < 0:
+        top = local_y - buffer
+        height -= top
+    elif vertical > 0:
+        height = local_y
+    return width, height, left, top
+
+
+class ResizeHandles:
+    """Resize handles of one layer, precomputed in the layer's rotated frame for cheap hover and click tests."""
+
+    def __init__(self, buffer=5, proximity_threshold=15):
+        """Initialize with the border buffer and grab distance used by is_near_border."""
+        self.buffer = buffer
+        self.threshold_sq = proximity_threshold ** 2
+        self.layer = None  # Layer the handles belong to
+        self.positions = {}  # Handle name -> canvas position, for drawing
+        self._transform = None  # Layer transform the handles were built from
+        self._inverse = None
+        self._bounds = (0, 0, 0, 0)  # Bordered rectangle in local coordinates
+
+    def attach(self, layer):
+        """Attach the handles to a layer (or None) and precompute their geometry."""
+        self.layer = layer
+        self._transform = None
+        if layer is not None:
+            self._build()
+
+    def _build(self):
+        """Compute handle positions and the canvas-to-local mapping from the layer's current transform."""
+        layer = self.layer
+        transform = layer.get_transform()
+        left, top = -self.buffer, -self.buffer
+        right, bottom = layer.width + self.buffer, layer.height + self.buffer
+        mid_x, mid_y = (left + right) / 2, (top + bottom) / 2
+        local_positions = (
+            (left, top), (right, top), (left, bottom), (right, bottom),
+            (mid_x, top), (left, mid_y), (right, mid_y), (mid_x, bottom),
+        )
+        self.positions = {
+            name: apply_transform(transform, px, py) for name, (px, py) in zip(HANDLE_NAMES, local_positions)
+        }
+        self._transform = transform
+        self._inverse = layer.get_inverse_transform()
+        self._bounds = (left, top, right, bottom)
+
+    def hit_test(self, mouse_x, mouse_y):
+        """Return the name of the handle under the cursor, or None."""
+        if self.layer is None:
+            return None
+        if self.layer.get_transform() is not self._transform:
+            self._build()  # Layer moved, rotated or resized since the last build
+        a, b, c, d, e, f = self._inverse
+        local_x = a * mouse_x + b * mouse_y + c
+        local_y = d * mouse_x + e * mouse_y + f
+        left, top, right, bottom = self._bounds
+        threshold_sq = self.threshold_sq
+
+        dx_left = (local_x - left) ** 2
+        dx_right = (local_x - right) ** 2
+        dy_top = (local_y - top) ** 2
+        dy_bottom = (local_y - bottom) ** 2
+        # Corners first, in is_near_border order
+        if dx_left + dy_top < threshold_sq:
+            return "top-left"
+        if dx_right + dy_top < threshold_sq:
+            return "top-right"
+        if dx_left + dy_bottom < threshold_sq:
+            return "bottom-left"
+        if dx_right + dy_bottom < threshold_sq:
+            return "bottom-right"
+
+        # Edges are axis-aligned in the local frame, so the clamped offset is the distance along them
+        clamp_x = local_x - min(max(local_x, left), right)
+        clamp_y = local_y - min(max(local_y, top), bottom)
+        if clamp_x * clamp_x + dy_top < threshold_sq:
+            return "top"
+        if dx_left + clamp_y * clamp_y < threshold_sq:
+            return "left"
+        if dx_right + clamp_y * clamp_y < threshold_sq:
+            return "right"
+        if clamp_x * clamp_x + dy_bottom < threshold_sq:
+            return "bottom"
+        return None
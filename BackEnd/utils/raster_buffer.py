@@ -0,0 +1,50 @@
+# utils/raster_buffer.py
+
+
+class SharedRaster:
+    """
+    Reference-counted, copy-on-write handle to raster pixels (a PIL image or a pygame surface).
+
+    share() hands out another handle on the same pixels in O(1). The pixels are only copied when a
+    handle asks to write while other handles still share them, so duplicates and resets stay cheap
+    until someone actually edits.
+    """
+
+    def __init__(self, pixels):
+        """Wrap pixels that no other handle refers to."""
+        self._pixels = pixels
+        self._owners = [1]  # Handle count, shared by every handle on these pixels
+
+    def share(self):
+        """Return another handle on the same pixels without copying them."""
+        handle = SharedRaster.__new__(SharedRaster)
+        handle._pixels = self._pixels
+        handle._owners = self._owners
+        self._owners[0] += 1
+        return handle
+
+    @property
+    def is_shared(self):
+        """Whether other handles refer to the same pixels."""
+        return self._owners[0] > 1
+
+    def read(self):
+        """Return the pixels for reading; they may be shared, so they must not be modified."""
+        return self._pixels
+
+    def write(self):
+        """Return pixels this handle owns alone and may modify in place, copying them first if shared."""
+        if self._owners[0] > 1:
+            self._owners[0] -= 1
+            self._pixels = self._pixels.copy()
+            self._owners = [1]
+        return self._pixels
+
+    def release(self):
+        """Drop this handle's reference; the handle cannot be used afterwards."""
+        if self._pixels is not None:
+            self._owners[0] -= 1
+            self._pixels = None
+
+    def __del__(self):
+        self.release()
@@ -0,0 +1,94 @@
+# utils/spatial_index.py
+import math
+
+
+class SpatialGrid:
+    """Uniform grid that buckets items by their axis-aligned bounds for fast point and area queries."""
+
+    def __init__(self, cell_size=128):
+        """Initialize an empty grid with square cells of the given size (in canvas pixels)."""
+        self.cell_size = cell_size
+        self._cells = {}  # (col, row) -> set of item keys
+        self._items = {}  # item key -> item
+        self._ranges = {}  # item key -> (min_col, min_row, max_col, max_row)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def _cell_range(self, bounds):
+        """Convert (min_x, min_y, max_x, max_y) bounds to an inclusive range of cell coordinates."""
+        min_x, min_y, max_x, max_y = bounds
+        size = self.cell_size
+        return (
+            math.floor(min_x / size),
+            math.floor(min_y / size),
+            math.floor(max_x / size),
+            math.floor(max_y / size),
+        )
+
+    def insert(self, key, item, bounds):
+        """Insert an item, or move it if the key is already indexed."""
+        cell_range = self._cell_range(bounds)
+        if key in self._items:
+            if self._ranges[key] == cell_range:
+                self._items[key] = item  # Still covers the same cells, nothing to rebucket
+                return
+            self.remove(key)
+        min_col, min_row, max_col, max_row = cell_range
+        for col in range(min_col, max_col + 1):
+            for row in range(min_row, max_row + 1):
+                self._cells.setdefault((col, row), set()).add(key)
+        self._items[key] = item
+        self._ranges[key] = cell_range
+
+    update = insert
+
+    def remove(self, key):
+        """Remove an item from the grid; unknown keys are ignored."""
+        cell_range = self._ranges.pop(key, None)
+        if cell_range is None:
+            return
+        del self._items[key]
+        min_col, min_row, max_col, max_row = cell_range
+        for col in range(min_col, max_col + 1):
+            for row in range(min_row, max_row + 1):
+                bucket = self._cells.get((col, row))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._cells[(col, row)]
+
+    def clear(self):
+        """Remove every item from the grid."""
+        self._cells.clear()
+        self._items.clear()
+        self._ranges.clear()
+
+    def query_point(self, x, y):
+        """Return the items whose bounds may contain the point (x, y)."""
+        size = self.cell_size
+        bucket = self._cells.get((math.floor(x / size), math.floor(y / size)))
+        if not bucket:
+            return []
+        return [self._items[key] for key in bucket]
+
+    def query_rect(self, min_x, min_y, max_x, max_y):
+        """Return the distinct items whose bounds may overlap the given area."""
+        min_col, min_row, max_col, max_row = self._cell_range((min_x, min_y, max_x, max_y))
+        cells = self._cells
+        keys = set()
+        if (max_col - min_col + 1) * (max_row - min_row + 1) > len(cells):
+            # Area spans more cells than are occupied; walk the occupied ones instead
+            for (col, row), bucket in cells.items():
+                if min_col <= col <= max_col and min_row <= row <= max_row:
+                    keys.update(bucket)
+        else:
+            for col in range(min_col, max_col + 1):
+                for row in range(min_row, max_row + 1):
+                    bucket = cells.get((col, row))
+                    if bucket:
+                        keys.update(bucket)
+        return [self._items[key] for key in keys]
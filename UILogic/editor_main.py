@@ -8,6 +8,7 @@ from BackEnd.controllers.layer_controller import LayerController
 from BackEnd.controllers.shape_controller import ShapeController
 from BackEnd.models.layerList_model import LayerList
 from BackEnd.tools.shape_tool import ShapeTool
+from BackEnd.tools.raster_pool import RasterPool
 from UILogic.shape_manager import ShapeManager
 
 
@@ -24,6 +25,7 @@ class EditorMainWindow(QtWidgets.QMainWindow):
         self.layer_controller = LayerController(self.layer_list)
         self.shape_controller = ShapeController(self.layer_controller)
         self.shape_tool = ShapeTool()
+        self.raster_pool = RasterPool()  # Worker processes for rasterizing many layers at once
 
         # Initialize Pygame for drawing
         pygame.init()
@@ -39,7 +41,8 @@ class EditorMainWindow(QtWidgets.QMainWindow):
         # Initialize managers
         self.shape_manager = ShapeManager(
             self.layer_controller, self.shape_controller, self.shape_tool,
-            self.canvas_size, self.canvas_surface, self.canvas_label
+            self.canvas_size, self.canvas_surface, self.canvas_label,
+            raster_pool=self.raster_pool
         )
         
         # Connect tool buttons to switch pages in the stacked widget
@@ -61,6 +64,7 @@ class EditorMainWindow(QtWidgets.QMainWindow):
         self.shape_manager.update_canvas()
 
     def closeEvent(self, event):
+        self.raster_pool.shutdown()
         pygame.quit()
         event.accept()
 
@@ -1,10 +1,12 @@
 import os
-import pygame
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QListWidgetItem
-from PyQt6.QtGui import QPixmap, QIcon, QImage
+from PyQt6.QtGui import QPixmap, QIcon
 from PyQt6.QtCore import Qt, QSize
 from BackEnd.controllers.image_controller import ImageController
 from BackEnd.controllers.upload_controller import UploadController
+from BackEnd.utils.geometry_utils import bounds_overlap, get_rotated_bounds
+from UILogic.pixel_bridge import pil_to_qpixmap, surface_to_qpixmap
+from UILogic.render_scheduler import RenderScheduler
 
 class ImageManager:
     """
@@ -33,6 +35,11 @@ class ImageManager:
         # Setup current transformation parameters
         self.current_rotation = 0
         self.currently_selected_image = None
+        self.zoom_factor = 1.0  # Canvas zoom scale from the zoom slider
+        self.culled_images = 0  # Images skipped in the last render because they were outside the viewport
+        
+        # Mutations request a redraw; render_canvas runs at most once per frame
+        self.render_scheduler = RenderScheduler(self.render_canvas)
         
         # Connect signals
         self.setup_connections()
@@ -185,7 +192,7 @@ class ImageManager:
                 image_model = self.image_controller.create_image_model(file_path, center_x, center_y)
                 self.currently_selected_image = image_model
                 self.image_controller.select_image_model(center_x, center_y)
-                self.render_canvas()
+                self.render_scheduler.request_redraw()
                 print(f"Selected image: {file_path}")
             else:
                 QMessageBox.warning(self.main_window, "Warning", "Failed to load the image.")
@@ -217,7 +224,7 @@ class ImageManager:
         center_y = self.canvas_height // 2
         
         image_model = self.image_controller.create_image_model(image_path, center_x, center_y)
-        self.render_canvas()
+        self.render_scheduler.request_redraw()
         
         self.image_controller.select_image_model(center_x, center_y)
         self.currently_selected_image = image_model
@@ -226,8 +233,16 @@ class ImageManager:
         """Render all images on the canvas (placeholder)."""
         # TODO: Implement with QGraphicsView
         self.clear_canvas()
+        # Canvas area in document coordinates at the current zoom
+        viewport = (0, 0, self.canvas_width / self.zoom_factor, self.canvas_height / self.zoom_factor)
+        culled = 0
         for image_model in self.image_controller.get_all_image_models():
+            bounds = get_rotated_bounds(image_model.x, image_model.y, image_model.width, image_model.height, image_model.rotation)
+            if not bounds_overlap(bounds, viewport):
+                culled += 1
+                continue
             self.draw_image_on_canvas(image_model)
+        self.culled_images = culled
 
     def draw_image_on_canvas(self, image_model):
         """
@@ -236,7 +251,7 @@ class ImageManager:
         Args:
             image_model: The image model to draw
         """
-        # TODO: Convert pygame.Surface to QPixmap and add to QGraphicsScene
+        # TODO: Convert image_model.get_scaled_image(self.zoom_factor) to QPixmap and add to QGraphicsScene
         pass
 
     def clear_canvas(self):
@@ -258,7 +273,7 @@ class ImageManager:
         self.currently_selected_image = selected_model
         
         self.update_ui_for_selection()
-        self.render_canvas()
+        self.render_scheduler.request_redraw()
 
     def update_ui_for_selection(self):
         """Update UI elements based on the current selection (placeholder)."""
@@ -275,19 +290,19 @@ class ImageManager:
         if self.currently_selected_image:
             self.image_controller.rotate_active_model(angle)
             self.current_rotation = (self.current_rotation + angle) % 360
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
 
     def flip_image_horizontal(self):
         """Flip the currently selected image horizontally."""
         if self.currently_selected_image:
             self.image_controller.flip_active_model_horizontal()
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
 
     def flip_image_vertical(self):
         """Flip the currently selected image vertically."""
         if self.currently_selected_image:
             self.image_controller.flip_active_model_vertical()
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
 
     def move_image(self, dx, dy):
         """
@@ -299,14 +314,14 @@ class ImageManager:
         """
         if self.currently_selected_image:
             self.image_controller.move_active_model(dx, dy)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
 
     def delete_selected_image(self):
         """Delete the currently selected image from the canvas."""
         if self.currently_selected_image:
             self.image_controller.remove_image_model(self.currently_selected_image)
             self.currently_selected_image = None
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
 
     def apply_image_effect(self, effect_name, *args):
         """
@@ -318,7 +333,7 @@ class ImageManager:
         """
         if self.currently_selected_image:
             self.image_controller.apply_image_tool_action(effect_name, *args)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
 
     def handle_zoom_change(self, zoom_value):
         """
@@ -327,9 +342,9 @@ class ImageManager:
         Args:
             zoom_value: The new zoom value (0-200)
         """
-        scale_factor = zoom_value / 100.0
-        # TODO: Apply scale_factor to QGraphicsView
-        self.render_canvas()
+        self.zoom_factor = max(zoom_value, 1) / 100.0
+        # TODO: Apply zoom_factor to QGraphicsView
+        self.render_scheduler.request_redraw()
 
     def zoom_in(self):
         """Increase zoom level."""
@@ -351,16 +366,11 @@ class ImageManager:
         Returns:
             QPixmap representation of the image
         """
-        if pil_image.mode == "RGBA":
-            qim = QImage(pil_image.tobytes("raw", "RGBA"), pil_image.width, pil_image.height, QImage.Format_RGBA8888)
-        else:
-            qim = QImage(pil_image.tobytes("raw", "RGB"), pil_image.width, pil_image.height, QImage.Format_RGB888)
-            
-        return QPixmap.fromImage(qim)
+        return pil_to_qpixmap(pil_image)
 
     def pygame_to_qpixmap(self, pygame_surface):
         """
-        Convert a Pygame Surface to a QPixmap for display in Qt widgets.
+        Convert a Pygame Surface to a QPixmap for display in Qt widgets, without copying its pixels first.
         
         Args:
             pygame_surface: Pygame Surface object
@@ -368,7 +378,4 @@ class ImageManager:
         Returns:
             QPixmap representation of the surface
         """
-        img_data = pygame.image.tostring(pygame_surface, "RGBA")
-        width, height = pygame_surface.get_size()
-        qimage = QImage(img_data, width, height, QImage.Format_RGBA8888)
-        return QPixmap.fromImage(qimage)
\ No newline at end of file
+        return surface_to_qpixmap(pygame_surface)
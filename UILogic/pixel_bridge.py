@@ -0,0 +1,138 @@
+# UILogic/pixel_bridge.py
+import sys
+from contextlib import contextmanager
+
+import pygame
+
+# (R, G, B, A) masks of 32-bit pygame surfaces -> QImage format with the same byte layout
+_SURFACE_FORMATS = {
+    (0x00ff0000, 0x0000ff00, 0x000000ff, 0xff000000): "Format_ARGB32",  # BGRA in memory
+    (0x000000ff, 0x0000ff00, 0x00ff0000, 0xff000000): "Format_RGBA8888",
+    (0x00ff0000, 0x0000ff00, 0x000000ff, 0x00000000): "Format_RGB32",  # BGRX in memory
+    (0x000000ff, 0x0000ff00, 0x00ff0000, 0x00000000): "Format_RGBX8888",
+}
+
+# PIL mode -> (raw mode passed to tobytes, QImage format, bytes per pixel)
+_PIL_FORMATS = {
+    "RGBA": ("RGBA", "Format_RGBA8888", 4),
+    "RGB": ("RGB", "Format_RGB888", 3),
+    "L": ("L", "Format_Grayscale8", 1),
+}
+
+
+def _qt_gui():
+    """Return the QtGui module of the Qt binding the application already uses (PyQt6 first, then PyQt5)."""
+    for name in ("PyQt6.QtGui", "PyQt5.QtGui"):
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+    try:
+        from PyQt6 import QtGui
+    except ImportError:
+        from PyQt5 import QtGui
+    return QtGui
+
+
+def _image_format(qimage_class, name):
+    """Look up a QImage format by name under both the PyQt5 and the scoped PyQt6 enum spelling."""
+    fmt = getattr(qimage_class, name, None)
+    if fmt is None:
+        fmt = getattr(qimage_class.Format, name)
+    return fmt
+
+
+def _wrap(data, width, height, bytes_per_line, format_name, source):
+    """Build a QImage over data and keep the objects owning the pixels alive as long as the image."""
+    qimage_class = _qt_gui().QImage
+    qimage = qimage_class(data, width, height, bytes_per_line, _image_format(qimage_class, format_name))
+    qimage._pixel_source = source  # QImage does not own the buffer; it must outlive the image
+    return qimage
+
+
+@contextmanager
+def surface_qimage(surface):
+    """
+    Wrap a pygame Surface (or subsurface) in a QImage that shares its pixels, without copying.
+
+    The surface stays locked while the block runs, so the QImage must only be used (drawn,
+    converted to a QPixmap) inside the with-block. Surfaces whose pixel layout Qt cannot read
+    directly fall back to a single copy.
+
+    Args:
+        surface: Pygame Surface object
+
+    Yields:
+        QImage viewing the surface pixels
+    """
+    width, height = surface.get_size()
+    format_name = _SURFACE_FORMATS.get(surface.get_masks()) if surface.get_bytesize() == 4 else None
+    if format_name is None:
+        data = pygame.image.tobytes(surface, "RGBA")
+        yield _wrap(data, width, height, width * 4, "Format_RGBA8888", data)
+        return
+
+    # Subsurfaces share the parent's memory; view the parent buffer from the subsurface's first pixel
+    root = surface
+    offset_x = offset_y = 0
+    while root.get_parent() is not None:
+        x, y = root.get_offset()
+        offset_x += x
+        offset_y += y
+        root = root.get_parent()
+    pitch = root.get_pitch()
+    proxy = root.get_view("0")  # Locks the surface until the proxy is released
+    buffer = memoryview(proxy)
+    view = buffer[offset_y * pitch + offset_x * 4:]
+    try:
+        yield _wrap(view, width, height, pitch, format_name, (root, proxy))
+    finally:
+        view.release()
+        buffer.release()
+        del proxy
+
+
+def surface_to_qpixmap(surface):
+    """
+    Convert a Pygame Surface to a QPixmap for display in Qt widgets, reading its pixels in place.
+
+    Args:
+        surface: Pygame Surface object
+
+    Returns:
+        QPixmap representation of the surface
+    """
+    with surface_qimage(surface) as qimage:
+        return _qt_gui().QPixmap.fromImage(qimage)
+
+
+def pil_to_qimage(pil_image):
+    """
+    Convert a PIL Image to a QImage with a single copy of the pixel data.
+
+    PIL does not expose its pixels as one contiguous buffer, so the bytes from tobytes() are
+    wrapped directly (with an explicit stride) instead of going through further conversions.
+
+    Args:
+        pil_image: PIL Image object
+
+    Returns:
+        QImage that owns a reference to its pixel data
+    """
+    if pil_image.mode not in _PIL_FORMATS:
+        pil_image = pil_image.convert("RGBA")
+    raw_mode, format_name, bytes_per_pixel = _PIL_FORMATS[pil_image.mode]
+    data = pil_image.tobytes("raw", raw_mode)
+    return _wrap(data, pil_image.width, pil_image.height, pil_image.width * bytes_per_pixel, format_name, data)
+
+
+def pil_to_qpixmap(pil_image):
+    """
+    Convert a PIL Image to a QPixmap for display in Qt widgets.
+
+    Args:
+        pil_image: PIL Image object
+
+    Returns:
+        QPixmap representation of the image
+    """
+    return _qt_gui().QPixmap.fromImage(pil_to_qimage(pil_image))
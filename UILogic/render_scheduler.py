@@ -0,0 +1,92 @@
+# UILogic/render_scheduler.py
+import time
+
+from PyQt6.QtCore import QTimer
+
+
+class RenderScheduler:
+    """
+    Coalesces redraw requests into at most one render per frame, like requestAnimationFrame.
+    Mutations call request_redraw(); the render callback runs once at the next frame boundary.
+    """
+    def __init__(self, render_callback, fps=60):
+        """
+        Initialize the scheduler.
+
+        Args:
+            render_callback: Function that composites the scene
+            fps (int): Target frame rate; requests within one frame interval share a single render
+        """
+        self.render_callback = render_callback
+        self.frame_interval = 1.0 / fps  # Seconds between frame boundaries
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_frame)
+        self._dirty = False  # True while a render is pending
+        self._last_frame_start = None  # perf_counter() when the previous frame started
+        # Frame statistics
+        self.requests = 0  # Total redraw requests
+        self.frames = 0  # Renders actually performed
+        self.coalesced = 0  # Requests folded into an already scheduled render
+        self.last_frame_time = 0.0  # Duration of the latest render, in seconds
+        self.total_frame_time = 0.0
+        self.max_frame_time = 0.0
+
+    def request_redraw(self):
+        """Mark the scene dirty and schedule a render at the next frame boundary."""
+        self.requests += 1
+        if self._dirty:
+            self.coalesced += 1  # Already scheduled; this request shares that render
+            return
+        self._dirty = True
+        delay = 0.0
+        if self._last_frame_start is not None:
+            delay = max(0.0, self.frame_interval - (time.perf_counter() - self._last_frame_start))
+        self._timer.start(int(delay * 1000))
+
+    def flush(self):
+        """Render immediately if a redraw is pending (e.g. before exporting or closing)."""
+        if self._dirty:
+            self._timer.stop()
+            self._run_frame()
+
+    def cancel(self):
+        """Drop a pending redraw without rendering."""
+        self._timer.stop()
+        self._dirty = False
+
+    def is_pending(self):
+        """Return True if a render is scheduled."""
+        return self._dirty
+
+    def _run_frame(self):
+        """Run the render callback once and record its timing."""
+        self._dirty = False  # Requests made during the render schedule the next frame
+        start = time.perf_counter()
+        self._last_frame_start = start
+        self.render_callback()
+        elapsed = time.perf_counter() - start
+        self.frames += 1
+        self.last_frame_time = elapsed
+        self.total_frame_time += elapsed
+        self.max_frame_time = max(self.max_frame_time, elapsed)
+
+    def get_stats(self):
+        """Return frame statistics: requests, frames, coalesced requests and frame times in milliseconds."""
+        return {
+            "requests": self.requests,
+            "frames": self.frames,
+            "coalesced": self.coalesced,
+            "last_frame_ms": self.last_frame_time * 1000,
+            "avg_frame_ms": self.total_frame_time * 1000 / self.frames if self.frames else 0.0,
+            "max_frame_ms": self.max_frame_time * 1000,
+        }
+
+    def reset_stats(self):
+        """Reset the frame statistics."""
+        self.requests = 0
+        self.frames = 0
+        self.coalesced = 0
+        self.last_frame_time = 0.0
+        self.total_frame_time = 0.0
+        self.max_frame_time = 0.0
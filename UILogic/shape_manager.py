@@ -1,10 +1,16 @@
 # UILogic/shape_manager.py
+import math
+import time
 import pygame
+from PyQt5.QtGui import QPainter, QPixmap
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import QMessageBox
 from BackEnd.models.shape_model import ShapeModel
+from BackEnd.tools.tile_renderer import TileRenderer
+from UILogic.pixel_bridge import surface_qimage
 
 class ShapeManager:
-    def __init__(self, layer_controller, shape_controller, shape_tool, canvas_size, canvas_surface, canvas_label):
+    def __init__(self, layer_controller, shape_controller, shape_tool, canvas_size, canvas_surface, canvas_label, document_size=None, raster_pool=None):
         self.layer_controller = layer_controller
         self.shape_controller = shape_controller
         self.shape_tool = shape_tool
@@ -12,6 +18,28 @@ class ShapeManager:
         self.canvas_surface = canvas_surface
         self.canvas_label = canvas_label
         self.selected_shape_type = None
+        self._pixmap = QPixmap(canvas_size[0], canvas_size[1])  # Persistent pixmap updated region by region
+        self._pixmap.fill(Qt.transparent)
+        # The document may be larger than the canvas; the canvas shows the viewport area of it
+        self.document_size = document_size or canvas_size
+        self.viewport = pygame.Rect((0, 0), canvas_size)
+        self.tiles = TileRenderer(self._draw_layer, self.document_size)
+        self.culled_layers = 0  # Layers skipped in the last frame (hidden, transparent or outside the viewport)
+        self.raster_pool = raster_pool  # Optional RasterPool for rasterizing many changed layers in parallel
+        self._changed_layers = {}  # Layer id -> layer changed since the last update, to pre-rasterize
+        self._full_redraw = True
+        # Progressive rendering: low-res draft rasters while the user interacts, full quality once idle
+        self.draft_scale = 0.5  # Raster scale used for draft frames
+        self.idle_delay = 150  # Milliseconds without input before refining to full quality
+        self._draft = False
+        self._draft_layers = set()  # Ids of layers currently shown as drafts
+        self._last_change = 0.0  # perf_counter() of the previous layer change
+        self._idle_timer = QTimer()
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self._refine)
+        for layer in self.layer_controller.get_layers():
+            self._track_layer(layer)
+        self.layer_controller.add_change_listener(self._on_layers_changed)
 
     def select_shape(self, shape_type):
         """Store the selected shape type."""
@@ -40,39 +68,139 @@ class ShapeManager:
 
             # Add the shape as a layer
             layer = self.layer_controller.add_layer(shape, name=self.selected_shape_type)
-            layer.x = self.canvas_size[0] // 2 - 50  # Center the shape
-            layer.y = self.canvas_size[1] // 2 - 50
+            self.layer_controller.move_layer(
+                layer,
+                self.viewport.centerx - 50 - layer.x,  # Center the shape in the view
+                self.viewport.centery - 50 - layer.y
+            )
             self.layer_controller.select_layer(layer)
 
             # Redraw the canvas
             self.update_canvas()
 
+    def begin_interaction(self):
+        """Render draft frames until input has been idle for idle_delay (drags, resizes, zoom scrubbing)."""
+        self._draft = True
+        self._idle_timer.start(self.idle_delay)
+
+    def _refine(self):
+        """Input went idle: redraw the layers shown as drafts at full quality."""
+        self._draft = False
+        for layer_id in self._draft_layers:
+            layer = self.layer_controller.layers.get(layer_id)
+            rect = self.tiles.get_layer_rect(layer) if layer is not None else None
+            if rect is not None:
+                self.tiles.invalidate(rect)
+        self._draft_layers.clear()
+        self.update_canvas()
+
+    def _on_layers_changed(self, layers):
+        """Invalidate the tiles under the old and new areas of changed layers."""
+        now = time.perf_counter()
+        if self._draft or now - self._last_change < self.idle_delay / 1000:
+            self.begin_interaction()  # Changes arriving back to back are an interaction in progress
+        self._last_change = now
+        for layer in layers:
+            self._track_layer(layer)
+            self._changed_layers[layer.id] = layer
+
+    def _track_layer(self, layer):
+        """Register a layer's drawn area with the tile renderer, or drop it if it is not drawn."""
+        if (layer in self.layer_controller.layers and layer.visible and isinstance(layer.object, ShapeModel)
+                and layer.object.alpha > 0):
+            self.tiles.update_layer(layer, self._layer_rect(layer))
+        else:
+            self.tiles.remove_layer(layer)
+
+    def _layer_rect(self, layer):
+        """Return the document area a shape layer covers when drawn (padded to whole pixels)."""
+        shape = layer.object
+        return pygame.Rect(math.floor(layer.x), math.floor(layer.y), shape.width + 1, shape.height + 1)
+
+    def invalidate(self, rect=None):
+        """Mark a document area (or, by default, the whole view) for redraw on the next update_canvas."""
+        if rect is None:
+            self._full_redraw = True
+            self.tiles.clear()
+        else:
+            self.tiles.invalidate(rect)
+
+    def set_viewport(self, x, y):
+        """Scroll the canvas to show the document from (x, y)."""
+        self.viewport.topleft = (x, y)
+        self._full_redraw = True
+
+    def set_document_size(self, document_size):
+        """Resize the document (e.g. for poster or print templates)."""
+        self.document_size = document_size
+        self.tiles.set_document_size(document_size)
+        self._full_redraw = True
+
+    def _raster_args(self, layer):
+        """Return the ShapeTool arguments that rasterize a shape layer at the current quality."""
+        shape = layer.object
+        return (
+            shape.shape_type,
+            shape.width,
+            shape.height,
+            shape.line_color,
+            shape.line_thickness,
+            shape.fill_color,
+            shape.border_radius,
+            shape.alpha,
+            layer.rotation,
+            self.draft_scale if self._draft else 1.0
+        )
+
+    def _prefetch_rasters(self, full):
+        """Rasterize the changed (or, on a full redraw, all) layers in view on the raster pool in one batch."""
+        changed = self._changed_layers
+        self._changed_layers = {}
+        if self.raster_pool is None:
+            return
+        if full:
+            layers = self.tiles.layers_in(self.viewport)
+        else:
+            layers = [layer for layer in changed.values() if self.tiles.get_layer_rect(layer) is not None
+                      and self.tiles.get_layer_rect(layer).colliderect(self.viewport)]
+        if len(layers) >= self.raster_pool.min_batch:
+            self.shape_tool.prefetch([self._raster_args(layer) for layer in layers], self.raster_pool)
+
+    def _draw_layer(self, surface, layer, x, y):
+        """Draw one shape layer at (x, y) on a tile surface, as a draft while interacting."""
+        shape = layer.object
+        if self._draft:
+            self._draft_layers.add(layer.id)
+        else:
+            self._draft_layers.discard(layer.id)
+        temp_surface = pygame.Surface((shape.width, shape.height), pygame.SRCALPHA)
+        temp_surface.fill((0, 0, 0, 0))  # Transparent background
+
+        self.shape_tool.draw(temp_surface, *self._raster_args(layer))
+
+        surface.blit(temp_surface, (x, y))
+
     def update_canvas(self):
-        """Update the canvas by drawing all visible layers."""
-        self.canvas_surface.fill((255, 255, 255, 0))  # Clear the canvas
-
-        for layer in self.layer_controller.get_visible_layers():
-            if isinstance(layer.object, ShapeModel):
-                shape = layer.object
-                temp_surface = pygame.Surface((shape.width, shape.height), pygame.SRCALPHA)
-                temp_surface.fill((0, 0, 0, 0))  # Transparent background
-
-                self.shape_tool.draw(
-                    temp_surface,
-                    shape.shape_type,
-                    shape.width,
-                    shape.height,
-                    shape.line_color,
-                    shape.line_thickness,
-                    shape.fill_color,
-                    shape.border_radius,
-                    shape.alpha,
-                    layer.rotation
-                )
-
-                self.canvas_surface.blit(temp_surface, (layer.x, layer.y))
-
-        pygame_image = pygame.image.tostring(self.canvas_surface, "RGBA")
-        qimage = parent.QtGui.QImage(pygame_image, self.canvas_size[0], self.canvas_size[1], parent.QtGui.QImage.Format_RGBA8888)
-        pixmap = parent.QtGui.QPixmap.fromImage(qimage)
-        self.canvas_label.setPixmap(pixmap)
\ No newline at end of file
+        """Update the canvas from the tile cache, re-rendering only tiles under changed layers."""
+        full = self._full_redraw
+        self._full_redraw = False
+        if full:
+            self.canvas_surface.fill((255, 255, 255, 0))  # Clear areas beyond the document edge
+        self._prefetch_rasters(full)
+        regions = self.tiles.render(self.canvas_surface, self.viewport, full)
+        self.culled_layers = len(self.layer_controller.layers) - len(self.tiles.layers_in(self.viewport))
+        if full:
+            regions = [self.canvas_surface.get_rect()]
+        if regions:
+            self._present(regions)
+
+    def _present(self, regions):
+        """Copy the given canvas regions into the label's pixmap."""
+        painter = QPainter(self._pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)  # Replace, don't blend over stale pixels
+        for region in regions:
+            # Qt reads the region straight out of the pygame surface's memory
+            with surface_qimage(self.canvas_surface.subsurface(region)) as qimage:
+                painter.drawImage(region.x, region.y, qimage)
+        painter.end()
+        self.canvas_label.setPixmap(self._pixmap)
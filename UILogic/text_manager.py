@@ -1,8 +1,9 @@
 from PyQt6.QtWidgets import QColorDialog
 from PyQt6.QtGui import QColor
-from PyQt6.QtGui import QPixmap, QIcon, QImage
 from PyQt6.QtCore import Qt
 from BackEnd.controllers.text_controller import TextController
+from UILogic.pixel_bridge import pil_to_qpixmap
+from UILogic.render_scheduler import RenderScheduler
 
 class TextManager:
     """
@@ -19,6 +20,8 @@ class TextManager:
         self.main_window = main_window
         self.text_controllers = []  # List to store TextController instances
         self.current_controller = None  # Currently selected TextController
+        self.render_scheduler = RenderScheduler(self.render_canvas)  # Coalesces redraws to one per frame
+        self.culled_texts = 0  # Texts skipped in the last render (transparent or outside the canvas)
         self.setup_connections()
 
     def setup_connections(self):
@@ -65,7 +68,7 @@ class TextManager:
         controller = TextController(x, y, text)
         self.text_controllers.append(controller)
         self.select_controller(controller)
-        self.render_canvas()
+        self.render_scheduler.request_redraw()
         print(f"Added text: {text}")
 
     def select_controller(self, controller):
@@ -102,7 +105,7 @@ class TextManager:
         if self.current_controller:
             bold = not self.current_controller.model.style.bold
             self.current_controller.set_formatting(bold=bold)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Toggled bold: {bold}")
 
     def toggle_italic(self):
@@ -110,7 +113,7 @@ class TextManager:
         if self.current_controller:
             italic = not self.current_controller.model.style.italic
             self.current_controller.set_formatting(italic=italic)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Toggled italic: {italic}")
 
     def toggle_underline(self):
@@ -118,21 +121,21 @@ class TextManager:
         if self.current_controller:
             underline = not self.current_controller.model.style.underline
             self.current_controller.set_formatting(underline=underline)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Toggled underline: {underline}")
 
     def set_alignment(self, align):
         """Set text alignment for the selected text."""
         if self.current_controller:
             self.current_controller.set_formatting(align=align)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Set alignment: {align}")
 
     def change_font(self, font_name):
         """Change the font for the selected text."""
         if self.current_controller:
             self.current_controller.set_formatting(font_name=font_name)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Changed font to: {font_name}")
 
     def change_color(self):
@@ -142,42 +145,42 @@ class TextManager:
             if color.isValid():
                 color_tuple = (color.red(), color.green(), color.blue())
                 self.current_controller.set_formatting(color=color_tuple)
-                self.render_canvas()
+                self.render_scheduler.request_redraw()
                 print(f"Changed color to: {color_tuple}")
 
     def update_text(self, new_text):
         """Update the content of the selected text."""
         if self.current_controller:
             self.current_controller.update_text(new_text)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Updated text to: {new_text}")
 
     def move_text(self, dx, dy):
         """Move the selected text by dx, dy."""
         if self.current_controller:
             self.current_controller.move(dx, dy)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Moved text by ({dx}, {dy})")
 
     def rotate_text(self, angle):
         """Rotate the selected text by the specified angle."""
         if self.current_controller:
             self.current_controller.rotate(angle)
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print(f"Rotated text by {angle} degrees")
 
     def flip_text_horizontal(self):
         """Flip the selected text horizontally."""
         if self.current_controller:
             self.current_controller.flip_horizontal()
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print("Flipped text horizontally")
 
     def flip_text_vertical(self):
         """Flip the selected text vertically."""
         if self.current_controller:
             self.current_controller.flip_vertical()
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print("Flipped text vertically")
 
     def delete_selected_text(self):
@@ -185,15 +188,26 @@ class TextManager:
         if self.current_controller:
             self.text_controllers.remove(self.current_controller)
             self.current_controller = None
-            self.render_canvas()
+            self.render_scheduler.request_redraw()
             print("Deleted selected text")
 
     def render_canvas(self):
         """Render all text objects on the canvas (placeholder)."""
         # TODO: Implement with QGraphicsView
         self.clear_canvas()
+        canvas_width = self.main_window.canvasFrame.width()
+        canvas_height = self.main_window.canvasFrame.height()
+        culled = 0
         for controller in self.text_controllers:
+            model = controller.model
+            image = model.current_image  # Already rotated, drawn axis-aligned at (x, y)
+            if (model.formatting['opacity'] <= 0 or image is None
+                    or model.x >= canvas_width or model.y >= canvas_height
+                    or model.x + image.width <= 0 or model.y + image.height <= 0):
+                culled += 1
+                continue
             self.draw_text_on_canvas(controller)
+        self.culled_texts = culled
 
     def draw_text_on_canvas(self, controller):
         """
@@ -233,8 +247,4 @@ class TextManager:
         Returns:
             QPixmap representation of the image
         """
-        if pil_image.mode == "RGBA":
-            qim = QImage(pil_image.tobytes("raw", "RGBA"), pil_image.width, pil_image.height, QImage.Format_RGBA8888)
-        else:
-            qim = QImage(pil_image.tobytes("raw", "RGB"), pil_image.width, pil_image.height, QImage.Format_RGB888)
-        return QPixmap.fromImage(qim)
\ No newline at end of file
+        return pil_to_qpixmap(pil_image)
@@ -0,0 +1,59 @@
+# tests/test_image_tool.py
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "BackEnd"))
+
+from tools.image_tool import ImageTool  # noqa: E402
+
+
+@pytest.fixture
+def source():
+    """Opaque noise, so any pixel sampled from outside a crop shows up as a difference."""
+    pixels = np.random.default_rng(0).integers(1, 256, (37, 53, 4), dtype=np.uint8)
+    return Image.fromarray(pixels, "RGBA")
+
+
+def make_tool(image):
+    tool = ImageTool(0, 0, *image.size)
+    tool.current_image = image
+    return tool
+
+
+def assert_same(actual, expected):
+    assert actual.size == expected.size
+    assert np.array_equal(np.asarray(actual), np.asarray(expected))
+
+
+@pytest.mark.parametrize("angle", [10, 20, 30, 60, 75, 90, 180, 270])
+def test_crop_then_rotate_matches_pil(source, angle):
+    tool = make_tool(source)
+    tool.crop((3, 4, 20, 30))
+    tool.rotate(angle)
+    assert_same(tool.current_image, source.crop((3, 4, 20, 30)).rotate(angle, expand=True))
+
+
+def test_crop_then_scale_matches_pil(source):
+    tool = make_tool(source)
+    tool.crop((3, 4, 20, 30))
+    tool.scale(2, 3)
+    expected = source.crop((3, 4, 20, 30)).resize((34, 78), Image.Resampling.NEAREST)
+    assert_same(tool.current_image, expected)
+
+
+def test_fractional_crop_rounds_like_pil(source):
+    tool = make_tool(source)
+    tool.crop((3.5, 4.2, 20.7, 30.1))
+    assert_same(tool.current_image, source.crop((3.5, 4.2, 20.7, 30.1)))
+
+
+@pytest.mark.parametrize("angles", [[30, -30], [10] * 36, [45] * 8, [90] * 4])
+def test_full_turn_restores_source(source, angles):
+    tool = make_tool(source)
+    for angle in angles:
+        tool.rotate(angle)
+    assert_same(tool.current_image, source)